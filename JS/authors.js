@@ -0,0 +1,82 @@
+// Busca de autores no índice data/configs/profs/search-index.json, gravado pelo src/DBLP/search.py
+// Mesma consulta de src/DBLP/authors.py: trigramas do nome, departamento e áreas, sem acentos
+
+var COREBR_FUZZY_MIN = 0.5;
+var COREBR_FUZZY_MIN_LENGTH = 4;	// Consultas mais curtas só casam por prefixo
+
+function corebrFold(text) {
+	// "João Araújo (UFMG)" -> "joao araujo ufmg"
+	var words = text.normalize("NFKD").replace(/[\u0300-\u036f]/g, "").toLowerCase().match(/[a-z0-9]+/g);
+	return words ? words.join(" ") : "";
+}
+
+function corebrGrams(words, partial) {
+	// Trigramas de " palavra " (com partial, a última palavra fica sem o espaço no fim)
+	var grams = [];
+	for (var i = 0; i < words.length; i++) {
+		var word = " " + words[i] + (partial && i == words.length - 1 ? "" : " ");
+		for (var j = 0; j + 3 <= word.length; j++) {
+			var gram = word.substring(j, j + 3);
+			if (grams.indexOf(gram) < 0) {
+				grams.push(gram);
+			}
+		}
+	}
+	return grams;
+}
+
+function CorebrAuthorIndex(data) {
+	this.data = data;
+	this.words = [];
+}
+
+CorebrAuthorIndex.prototype.getWords = function(i) {
+	// Palavras do texto de busca do autor, calculadas só para os candidatos
+	if (this.words[i] === undefined) {
+		var author = this.data.authors[i];
+		var text = [this.data.names[i], this.data.depts[author[0]]];
+		for (var a = 1; a < author.length; a++) {
+			text.push(this.data.areas[author[a]]);
+		}
+		this.words[i] = corebrFold(text.join(" ")).split(" ");
+	}
+	return this.words[i];
+};
+
+CorebrAuthorIndex.prototype.isPrefixMatch = function(i, words) {
+	var authorWords = this.getWords(i);
+	return words.every(function(word) {
+		return authorWords.some(function(w) { return w.indexOf(word) == 0; });
+	});
+};
+
+CorebrAuthorIndex.prototype.search = function(term, limit) {
+	// Nomes dos autores encontrados, os que casam todas as palavras primeiro
+	var folded = corebrFold(term);
+	var words = folded ? folded.split(" ") : [];
+	var grams = corebrGrams(words, true);
+	var fuzzy = words.join("").length >= COREBR_FUZZY_MIN_LENGTH;
+	var hits = {};
+	for (var g = 0; g < grams.length; g++) {
+		var postings = this.data.grams[grams[g]] || [];
+		var id = 0;
+		for (var p = 0; p < postings.length; p++) {
+			id += postings[p];
+			hits[id] = (hits[id] || 0) + 1;
+		}
+	}
+	var scored = [];
+	for (var key in hits) {
+		var i = parseInt(key);
+		if (this.isPrefixMatch(i, words)) {
+			scored.push([2, i]);
+		} else if (fuzzy && hits[key] >= COREBR_FUZZY_MIN * grams.length) {
+			scored.push([hits[key] / grams.length, i]);
+		}
+	}
+	var names = this.data.names;
+	scored.sort(function(a, b) {
+		return b[0] - a[0] || (names[a[1]] < names[b[1]] ? -1 : names[a[1]] > names[b[1]] ? 1 : 0);
+	});
+	return scored.slice(0, limit || 20).map(function(s) { return names[s[1]]; });
+};
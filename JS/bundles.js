@@ -0,0 +1,44 @@
+// Leitura dos pacotes JSON de cada área (data/bundles/<area>/), gravados pelo src/DBLP/search.py
+// O manifest.json diz o arquivo atual (com o hash do conteúdo no nome) de cada pacote
+
+var corebr_manifests = {};
+var corebr_bundles = {};
+
+function corebrManifest(area) {
+	// Um único pedido do manifesto por área, compartilhado por todos os gráficos da página
+	if (!(area in corebr_manifests)) {
+		corebr_manifests[area] = $.getJSON("/data/bundles/" + area + "/manifest.json");
+	}
+	return corebr_manifests[area];
+}
+
+function corebrBundle(area, name, callback) {
+	// Os gráficos da mesma página compartilham o pedido de cada pacote (ex: summary)
+	corebrManifest(area).done(function(manifest) {
+		var url = "/data/bundles/" + area + "/" + manifest.files[name];
+		if (!(url in corebr_bundles)) {
+			corebr_bundles[url] = $.getJSON(url);
+		}
+		corebr_bundles[url].done(callback);
+	});
+}
+
+// Artigos em páginas: a primeira é carregada na hora e as seguintes a cada clique em moreId;
+// draw recebe todas as linhas carregadas até agora
+function corebrPages(area, name, moreId, draw) {
+	var rows = [];
+	var page = 0;
+	function next() {
+		page++;
+		corebrBundle(area, name + "-" + page, function(data) {
+			rows = rows.concat(data.rows);
+			draw(rows);
+			$("#" + moreId).toggle(page < data.pages);
+		});
+	}
+	$("#" + moreId).click(function(event) {
+		event.preventDefault();
+		next();
+	});
+	next();
+}
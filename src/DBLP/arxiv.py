@@ -0,0 +1,126 @@
+# Links do arXiv dos artigos, consultados em lote antes da contagem dos artigos
+#
+# O search.py junta os DOIs de todos os artigos indexáveis que ainda não estão no cache e chama
+# Resolver.resolve() uma única vez; as consultas são feitas em paralelo, com vários títulos por
+# consulta (ti:"a" OR ti:"b" ...) e um limite de requisições por segundo. Durante a contagem dos
+# artigos o link é lido só do cache, sem acessar a rede.
+#
+# O cache é único para todas as áreas (data/cache/arxiv/arxiv-cache.csv, com DOI, link e a data
+# da consulta). Um "no_arxiv" vale por NEGATIVE_TTL segundos; depois o DOI é consultado de novo,
+# já que o artigo pode ter sido publicado no arXiv. Links encontrados não expiram. Falhas de rede
+# não entram no cache.
+#
+# O arquivo do cache é um log (cache.LogCache): cada consulta em lote acrescenta suas linhas assim
+# que termina, e a última linha de um DOI é a que vale. Se a execução for interrompida, as
+# consultas já feitas não se perdem. Quando o log tem linhas repetidas demais, ele é reescrito só
+# com a última de cada DOI.
+
+import os
+import csv
+import glob
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+import xmltodict
+from dblp import TokenBucket
+import cache
+import titles
+
+CACHE_DIR = '../../data/cache/arxiv/'
+CACHE_FILE = CACHE_DIR + 'arxiv-cache.csv'
+API_URL = "http://export.arxiv.org/api/query"
+NO_ARXIV = "no_arxiv"
+NEGATIVE_TTL = 30 * 24 * 3600   # 30 dias
+BATCH_SIZE = 10                 # Títulos por consulta
+TIMEOUT = 60
+
+def read_legacy_caches(arxiv_cache):
+    # Caches antigos, um por área (<area>-arxiv-cache.csv, sem data): vale a data do arquivo
+    for file in sorted(glob.glob(CACHE_DIR + '*-arxiv-cache.csv')):
+        checked = int(os.path.getmtime(file))
+        with open(file, encoding="utf-8", newline='') as f:
+            for line in csv.reader(f):
+                if len(line) >= 2:
+                    arxiv_cache.seed(line[0], line[1], checked)
+
+def load_cache():
+    # DOI -> link do arXiv ou "no_arxiv", no cache de log compartilhado (cache.LogCache)
+    arxiv_cache = cache.LogCache(CACHE_FILE)
+    read_legacy_caches(arxiv_cache)
+    return arxiv_cache
+
+def save_cache(arxiv_cache):
+    arxiv_cache.flush()
+
+def is_resolved(arxiv_cache, doi):
+    # True se o DOI está no cache e o resultado ainda vale ("no_arxiv" só por NEGATIVE_TTL)
+    if not arxiv_cache.contains(doi):
+        return False
+    return arxiv_cache.entries[doi][0] != NO_ARXIV or arxiv_cache.contains(doi, NEGATIVE_TTL)
+
+def get_url(arxiv_cache, doi):
+    url = arxiv_cache.get(doi)
+    return url if url is not None else NO_ARXIV
+
+def build_query(titles):
+    return " OR ".join('ti:"' + title.replace('"', '') + '"' for title in titles)
+
+def get_entries(arxiv_xml):
+    feed = xmltodict.parse(arxiv_xml)["feed"]
+    entries = feed.get("entry", [])
+    if isinstance(entries, dict):
+        entries = [entries]
+    return [(e["title"], e["id"]) for e in entries]
+
+def match_titles(batch_titles, entries):
+    # Cada entrada vale só para o título mais parecido da consulta (títulos quase iguais na mesma
+    # consulta não pegam o link um do outro); cada título fica com a entrada mais parecida
+    index = titles.TitleIndex()
+    for i, title in enumerate(batch_titles):
+        index.add(i, title)
+    best = {}
+    for arxiv_title, arxiv_url in entries:
+        match = index.find(arxiv_title)
+        if match is not None and match[1] > best.get(match[0], (0, NO_ARXIV))[0]:
+            best[match[0]] = (match[1], arxiv_url)
+    return {title: best.get(i, (0, NO_ARXIV))[1] for i, title in enumerate(batch_titles)}
+
+class Resolver:
+    # arXiv pede no máximo uma requisição a cada 3 segundos
+    def __init__(self, url=API_URL, rate=1/3, workers=4):
+        self.url = url
+        self.bucket = TokenBucket(rate)
+        self.workers = workers
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def query(self, titles):
+        # Retorna título -> link (ou "no_arxiv"), ou None se a consulta falhou
+        self.bucket.acquire()
+        payload = {'search_query': build_query(titles), 'start': 0, 'max_results': 5 * len(titles)}
+        try:
+            response = self.session.get(self.url, params=payload, timeout=TIMEOUT)
+            response.raise_for_status()
+            return match_titles(titles, get_entries(response.text))
+        except Exception as e:  # Rede, HTTP ou XML inválido: tenta de novo na próxima execução
+            print(f"arXiv: {e}")
+            return None
+
+    def resolve(self, arxiv_cache, papers):
+        # papers: DOI -> título; atualiza o cache (e o log) e retorna o número de DOIs resolvidos
+        dois = list(papers)
+        batches = [dois[i:i + BATCH_SIZE] for i in range(0, len(dois), BATCH_SIZE)]
+
+        resolved = 0
+        with ThreadPoolExecutor(self.workers) as pool:
+            futures = {pool.submit(self.query, [papers[doi] for doi in batch]): batch for batch in batches}
+            # Na ordem em que as consultas terminam, para não segurar resultados prontos
+            for future in as_completed(futures):
+                batch, urls = futures[future], future.result()
+                if urls is None:
+                    continue
+                # Grava no log assim que a consulta termina
+                arxiv_cache.put_many([(doi, urls[papers[doi]]) for doi in batch])
+                resolved += len(batch)
+        return resolved
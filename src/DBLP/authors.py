@@ -0,0 +1,154 @@
+# Índice de busca dos autores, gravado pelo search.py e usado pela caixa de busca de authors2.html
+#
+# Cada autor tem um id (a posição em ordem alfabética) e o texto de busca: nome, departamento e áreas,
+# sem acentos e em minúsculas. O índice guarda, para cada trigrama das palavras desse texto, a lista
+# dos ids dos autores que o contêm (codificada como diferenças entre ids consecutivos). As palavras
+# levam um espaço antes, então " jo" só aparece no início de uma palavra.
+#
+# Uma consulta soma, para cada autor, quantos trigramas da consulta ele tem (só as listas desses
+# trigramas são lidas, não a lista de autores inteira):
+#   - se todas as palavras da consulta são prefixos de palavras do autor, o autor vem primeiro;
+#   - senão, ele entra se tiver ao menos FUZZY_MIN dos trigramas (tolera erros de digitação), o que
+#     só vale para consultas com pelo menos FUZZY_MIN_LENGTH letras: "jao" tem só dois trigramas,
+#     e um em comum (" ja") bastaria para achar "Jayme".
+# JS/authors.js faz a mesma consulta no navegador.
+#
+# O search-index.json é gerado pelo search.py -all (junto com o all-authors.csv) e não fica no
+# repositório; sem ele, authors2.html volta a buscar na lista de nomes do all-authors.csv.
+#
+# How to use (from src/DBLP, depois do search.py -all):
+# python authors.py "marcos goncalv"
+# python authors.py ufmg --limit 50
+
+import os
+import re
+import sys
+import json
+import argparse
+import unicodedata
+
+INDEX_FILE = '../../data/configs/profs/search-index.json'
+VERSION = 1
+FUZZY_MIN = 0.5                 # Fração mínima de trigramas em comum para uma busca aproximada
+FUZZY_MIN_LENGTH = 4            # Consultas mais curtas só casam por prefixo
+LIMIT = 20                      # Sugestões por consulta
+
+def fold(text):
+    # "João Araújo (UFMG)" -> "joao araujo ufmg"
+    text = unicodedata.normalize('NFKD', text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(re.findall(r'[a-z0-9]+', text.lower()))
+
+def get_grams(words, partial=False):
+    # Trigramas de " palavra " (com partial, a última palavra, ainda sendo digitada, fica sem o
+    # espaço no fim)
+    grams = []
+    for i, word in enumerate(words):
+        word = " " + word + ("" if partial and i == len(words) - 1 else " ")
+        for j in range(len(word) - 2):
+            if word[j:j + 3] not in grams:
+                grams.append(word[j:j + 3])
+    return grams
+
+def get_text(name, dept, areas):
+    return fold(" ".join([name, dept] + list(areas)))
+
+def build_index(authors):
+    # authors: nome -> (departamento, áreas da maior para a menor produção)
+    names = sorted(authors)
+    depts = sorted(set(authors[name][0] for name in names))
+    areas = sorted(set(a for name in names for a in authors[name][1]))
+    dept_ids = {dept: i for i, dept in enumerate(depts)}
+    area_ids = {area: i for i, area in enumerate(areas)}
+    postings = {}
+    for i, name in enumerate(names):
+        dept, author_areas = authors[name]
+        for gram in get_grams(get_text(name, dept, author_areas).split()):
+            postings.setdefault(gram, []).append(i)
+    grams = {}
+    for gram in sorted(postings):
+        ids = postings[gram]
+        grams[gram] = [ids[0]] + [b - a for a, b in zip(ids, ids[1:])]
+    return {'version': VERSION, 'names': names, 'depts': depts, 'areas': areas,
+            'authors': [[dept_ids[authors[name][0]]] + [area_ids[a] for a in authors[name][1]] for name in names],
+            'grams': grams}
+
+class AuthorIndex:
+    def __init__(self, data):
+        self.names = data['names']
+        self.depts = data['depts']
+        self.areas = data['areas']
+        self.authors = data['authors']      # Id -> [id do departamento, ids das áreas]
+        self.grams = data['grams']
+        self.words = [None] * len(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def get_author(self, i):
+        author = self.authors[i]
+        return self.names[i], self.depts[author[0]], [self.areas[a] for a in author[1:]]
+
+    def get_postings(self, gram):
+        ids = []
+        i = 0
+        for delta in self.grams.get(gram, ()):
+            i += delta
+            ids.append(i)
+        return ids
+
+    def get_words(self, i):
+        # Palavras do texto de busca do autor, calculadas só para os candidatos
+        if self.words[i] is None:
+            self.words[i] = get_text(*self.get_author(i)).split()
+        return self.words[i]
+
+    def is_prefix_match(self, i, words):
+        author_words = self.get_words(i)
+        return all(any(w.startswith(word) for w in author_words) for word in words)
+
+    def search_ids(self, term, limit=LIMIT):
+        # Ids dos autores encontrados, os que casam todas as palavras primeiro
+        words = fold(term).split()
+        grams = get_grams(words, partial=True)
+        if not grams:
+            return []
+        fuzzy = len("".join(words)) >= FUZZY_MIN_LENGTH
+        hits = {}
+        for gram in grams:
+            for i in self.get_postings(gram):
+                hits[i] = hits.get(i, 0) + 1
+        scored = []
+        for i, count in hits.items():
+            if self.is_prefix_match(i, words):
+                scored.append((2.0, i))
+            elif fuzzy and count >= FUZZY_MIN * len(grams):
+                scored.append((count / len(grams), i))
+        scored.sort(key=lambda x: (-x[0], self.names[x[1]]))
+        return [i for _, i in scored[:limit]]
+
+    def search(self, term, limit=LIMIT):
+        return [self.names[i] for i in self.search_ids(term, limit)]
+
+def load_index(file=INDEX_FILE):
+    with open(file, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get('version') != VERSION:
+        raise ValueError(file + ": versão do índice desconhecida")
+    return AuthorIndex(data)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Busca no índice de autores (search-index.json)")
+    parser.add_argument("term", help="nome, parte do nome, departamento ou área")
+    parser.add_argument("--limit", type=int, default=LIMIT, help="número máximo de resultados")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if not os.path.exists(INDEX_FILE):
+        print(INDEX_FILE + " não existe; rode python search.py -all")
+        sys.exit(1)
+    index = load_index()
+    for i in index.search_ids(args.term, args.limit):
+        name, dept, areas = index.get_author(i)
+        print(name + "," + dept + "," + ";".join(areas))
@@ -0,0 +1,246 @@
+# Benchmark das etapas do search.py
+#
+# How to use (from src/DBLP):
+# python bench.py                                   (todas as áreas, arquivos de data/cache/dblp)
+# python bench.py cs robotics                       (só as áreas indicadas)
+# python bench.py --synthetic-researchers 10000 --synthetic-records 1000000
+# python bench.py --json bench.json                 (grava o resultado em JSON)
+#
+# As etapas rodam em uma cópia temporária de data/ (configurações, listas de conferências e caches
+# do arXiv e do Semantic Scholar), então os arquivos de saída do repositório não são alterados. O
+# corpus sintético é gerado a partir dos registros reais, com artigos repetidos entre
+# pesquisadores (coautoria).
+# A etapa de consulta ao arXiv (resolve_arxiv_urls) não é medida, para não depender da rede.
+
+import os
+import io
+import sys
+import csv
+import json
+import time
+import glob
+import random
+import shutil
+import argparse
+import tempfile
+import platform
+import threading
+import subprocess
+import contextlib
+from xml.sax.saxutils import escape, quoteattr
+import records
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(SRC_DIR, '..', '..', 'data')
+
+# Memória residente (RSS), amostrada em uma thread enquanto a etapa roda
+
+def get_rss():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource
+        # Sem /proc: usa o pico do processo inteiro (ru_maxrss em KB no Linux, bytes no macOS)
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == 'darwin' else rss * 1024
+
+class RssSampler(threading.Thread):
+    def __init__(self, interval=0.005):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = get_rss()
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            self.peak = max(self.peak, get_rss())
+
+    def stop(self):
+        self.done.set()
+        self.join()
+        self.peak = max(self.peak, get_rss())
+        return self.peak
+
+def measure(results, name, func, records_count=None):
+    # Roda func() uma vez e guarda tempo, registros/s e pico de RSS da etapa
+    # records_count pode ser uma função, chamada depois da etapa (fora da medição)
+    sampler = RssSampler()
+    sampler.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        value = func()
+    elapsed = time.perf_counter() - start
+    peak = sampler.stop()
+    if callable(records_count):
+        records_count = records_count()
+    stage = {'name': name, 'seconds': round(elapsed, 4), 'peak_rss_mb': round(peak / 2**20, 1)}
+    if records_count is not None:
+        stage['records'] = records_count
+        stage['records_per_sec'] = round(records_count / elapsed) if elapsed > 0 else None
+    results.append(stage)
+    print(f"{name:<28} {elapsed:9.3f} s  {stage.get('records_per_sec') or '':>10} rec/s  {stage['peak_rss_mb']:8.1f} MB")
+    return value
+
+# Corpus sintético
+
+def record_to_xml(record, key, url, suffix):
+    kind = record['type']
+    lines = ['<r><' + kind + ' key=' + quoteattr(key) + '>']
+    for author in record.get('author', []):
+        lines.append('<author>' + escape(author) + '</author>')
+    title = records.get_text(record.get('title', ''))
+    lines.append('<title>' + escape(title + suffix) + '</title>')
+    for field in ('pages', 'year', 'journal', 'booktitle', 'number'):
+        if record.get(field) is not None:
+            lines.append('<' + field + '>' + escape(record[field]) + '</' + field + '>')
+    if record.get('ee'):
+        lines.append('<ee>' + escape(record['ee'] + suffix) + '</ee>')
+    lines.append('<url>' + escape(url) + '</url>')
+    lines.append('</' + kind + '></r>')
+    return '\n'.join(lines)
+
+def generate_corpus(data_dir, researchers, total_records, seed):
+    # Gera XMLs sintéticos em data_dir/cache/dblp e o all-researchers.csv correspondente
+    rnd = random.Random(seed)
+    templates = []
+    for file in sorted(glob.glob(os.path.join(DATA_DIR, 'cache', 'dblp', '*.xml'))):
+        templates.extend(records.parse_records(file))
+    with open(os.path.join(DATA_DIR, 'configs', 'all-researchers.csv')) as f:
+        depts = sorted(set(row[1] for row in csv.reader(f)))
+
+    # Cada artigo do conjunto aparece, em média, para dois pesquisadores
+    pool = max(1, total_records // 2)
+    per_researcher = max(1, total_records // researchers)
+    dblp_dir = os.path.join(data_dir, 'cache', 'dblp')
+    os.makedirs(dblp_dir, exist_ok=True)
+    with open(os.path.join(data_dir, 'configs', 'all-researchers.csv'), 'w', encoding='utf-8') as out:
+        for j in range(researchers):
+            name = 'Synthetic Researcher ' + str(j)
+            out.write(name + ',' + rnd.choice(depts) + ',syn/' + str(j) + '\n')
+            papers = []
+            for i in rnd.sample(range(pool), min(per_researcher, pool)):
+                template = templates[i % len(templates)]
+                suffix = '-s' + str(i)
+                papers.append(record_to_xml(template, template.get('key', '') + suffix,
+                                            template.get('url', 'db/synthetic') + suffix, suffix))
+            with open(os.path.join(dblp_dir, name.replace(' ', '-') + '.xml'), 'w', encoding='utf-8') as f:
+                f.write('<?xml version="1.0"?>\n<dblpperson name=' + quoteattr(name) + '>\n')
+                f.write('\n'.join(papers))
+                f.write('\n</dblpperson>\n')
+
+# Cópia temporária de data/
+
+def make_workdir(tmp, synthetic_researchers, synthetic_records, seed):
+    data_dir = os.path.join(tmp, 'data')
+    os.makedirs(os.path.join(data_dir, 'configs', 'profs', 'papers'))
+    os.makedirs(os.path.join(data_dir, 'configs', 'profs', 'search'))
+    os.makedirs(os.path.join(tmp, 'src', 'DBLP'))
+    open(os.path.join(data_dir, 'configs', 'profs', 'search', 'empty.csv'), 'w').close()
+    for name in ('all-researchers.csv', 'manual-classification.csv', 'manual-journals.txt',
+                 'research-areas-config.csv', 'manual-classification-failed.csv'):
+        shutil.copy(os.path.join(DATA_DIR, 'configs', name), os.path.join(data_dir, 'configs'))
+    for pattern in ('*-confs.csv', '*-black-list.txt', '*-white-list.txt'):
+        for file in glob.glob(os.path.join(DATA_DIR, pattern)):
+            shutil.copy(file, data_dir)
+    shutil.copytree(os.path.join(DATA_DIR, 'cache', 'arxiv'), os.path.join(data_dir, 'cache', 'arxiv'))
+    if os.path.isdir(os.path.join(DATA_DIR, 'cache', 'scholar')):
+        shutil.copytree(os.path.join(DATA_DIR, 'cache', 'scholar'), os.path.join(data_dir, 'cache', 'scholar'))
+    if synthetic_researchers:
+        generate_corpus(data_dir, synthetic_researchers, synthetic_records, seed)
+    else:
+        # Os XMLs reais só são lidos; o cache pré-processado fica na cópia temporária
+        os.symlink(os.path.abspath(os.path.join(DATA_DIR, 'cache', 'dblp')),
+                   os.path.join(data_dir, 'cache', 'dblp'))
+    return os.path.join(tmp, 'src', 'DBLP')
+
+def get_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=SRC_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_stages(area_prefixes):
+    import search  # Importado depois do chdir: o search.py usa caminhos relativos a src/DBLP
+
+    stages = []
+    if not area_prefixes:
+        area_prefixes = search.get_area_prefixes(argparse.Namespace(all=True, areas=[]))
+    measure(stages, 'init_everything', lambda: search.init_everything(area_prefixes))
+
+    with open('../../data/configs/all-researchers.csv') as f:
+        researchers = list(csv.reader(f))
+    files = [search.get_dblp_file_name(r[0]) for r in researchers]
+
+    corpus = []
+    def count_records():
+        corpus.extend(records.load_records(file) for file in files)
+        return sum(len(rs) for rs in corpus)
+    results = measure(stages, 'parse_researcher (cold)',
+                      lambda: [search.parse_researcher(r) for r in researchers], count_records)
+    total = stages[-1]['records']
+    measure(stages, 'parse_researcher (warm)',
+            lambda: [search.parse_researcher(r) for r in researchers], total)
+
+    def parse_all():
+        for rs in corpus:
+            for area in search.Global.areas:
+                area.hits = []
+                area.mc_failed_papers = []
+            for dblp in rs:
+                search.parse_dblp(None, dblp)
+    measure(stages, 'parse_dblp', parse_all, total)
+
+    hits = sum(len(h) for result in results for h, _ in result)
+    measure(stages, 'add_researcher_results',
+            lambda: [search.add_researcher_results(r, result) for r, result in zip(researchers, results)],
+            hits)
+
+    papers = sum(len(area.papers) for area in search.Global.areas)
+    measure(stages, 'enrich_citations', search.enrich_citations, papers)
+    for writer in (search.output_papers, search.output_scores, search.output_venues,
+                   search.output_profs_list):
+        measure(stages, writer.__name__,
+                lambda: [writer(area) for area in search.Global.areas], papers)
+    measure(stages, 'output_arxiv_cache', search.output_arxiv_cache, len(search.Global.arxiv_cache))
+    other_area_profs = search.read_other_area_profs()
+    measure(stages, 'output_search_files', lambda: search.output_search_files(other_area_profs),
+            papers)
+    measure(stages, 'output_search_box_list', lambda: search.output_search_box_list(other_area_profs))
+    search.close_mc_failed_file()
+
+    corpus_info = {'researchers': len(researchers), 'records': total, 'indexable': hits,
+                   'papers': papers, 'areas': area_prefixes}
+    return corpus_info, stages
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark das etapas do search.py")
+    parser.add_argument("areas", nargs="*", help="prefixos das áreas (padrão: todas as áreas configuradas)")
+    parser.add_argument("--synthetic-researchers", type=int, default=0,
+                        help="gera um corpus sintético com este número de pesquisadores")
+    parser.add_argument("--synthetic-records", type=int, default=100000,
+                        help="número total de registros do corpus sintético")
+    parser.add_argument("--seed", type=int, default=1, help="semente do corpus sintético")
+    parser.add_argument("--json", help="arquivo onde gravar o resultado em JSON")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    with tempfile.TemporaryDirectory(prefix='bench-') as tmp:
+        print("Preparing data ...")
+        workdir = make_workdir(tmp, args.synthetic_researchers, args.synthetic_records, args.seed)
+        os.chdir(workdir)
+        corpus_info, stages = run_stages(args.areas)
+        os.chdir(SRC_DIR)
+    report = {
+        'commit': get_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': dict(corpus_info, synthetic=bool(args.synthetic_researchers)),
+        'stages': stages,
+    }
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,89 @@
+# Pacotes JSON de cada área para as páginas de gráficos (src/charts), gravados pelo search.py
+#
+# Em vez de baixar os <area>-out-*.csv e agregar tudo no navegador, as páginas leem de
+# data/bundles/<area>/:
+#   summary    séries prontas dos gráficos (artigos por local, pontuação dos departamentos do
+#              gráfico, professores) e o número de páginas de artigos
+#   papers-N   artigos em páginas de PAGE_SIZE, na ordem da tabela (também papers-C-N e papers-J-N,
+#              só conferências ou só jornais)
+# Cada arquivo tem o hash do conteúdo no nome (papers-1.<hash>.json) e é gravado também
+# comprimido (.gz e, se o módulo brotli estiver instalado, .br), para o servidor mandar a versão
+# comprimida direto. O manifest.json, sem hash no nome, diz o arquivo atual de cada pacote;
+# arquivos que saíram do manifesto são apagados.
+
+import os
+import gzip
+import json
+import hashlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BUNDLES_DIR = '../../data/bundles/'
+MANIFEST_FILE = 'manifest.json'
+PAGE_SIZE = 200
+CHART_DEPTS = 16                # Departamentos mostrados no gráfico de pontuação
+
+def encode(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def get_pages(name, rows):
+    # Páginas de PAGE_SIZE linhas: {"name-1": {...}, "name-2": {...}}; ao menos uma, mesmo vazia
+    pages = max(1, (len(rows) + PAGE_SIZE - 1) // PAGE_SIZE)
+    return {name + "-" + str(i + 1): {'page': i + 1, 'pages': pages, 'count': len(rows),
+                                       'rows': rows[i * PAGE_SIZE:(i + 1) * PAGE_SIZE]}
+            for i in range(pages)}
+
+def get_area_bundles(summary, papers):
+    # summary: séries dos gráficos; papers: linhas da tabela de artigos, na ordem de exibição
+    bundles = {}
+    bundles.update(get_pages("papers", papers))
+    for venue_type in ("C", "J"):
+        bundles.update(get_pages("papers-" + venue_type, [p for p in papers if p[7] == venue_type]))
+    bundles['summary'] = dict(summary, papers=len(papers), page_size=PAGE_SIZE,
+                              pages={t: bundles[t + "-1"]['pages'] for t in ("papers", "papers-C", "papers-J")})
+    return bundles
+
+def write_if_missing(file, data):
+    # O nome tem o hash do conteúdo: se o arquivo existe, já está atualizado
+    if not os.path.exists(file):
+        tmp = file + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, file)
+
+def write_bundle(directory, name, data):
+    # Grava o pacote (e as versões comprimidas) e retorna o nome do arquivo
+    data = encode(data)
+    file_name = name + "." + hashlib.sha1(data).hexdigest()[:12] + ".json"
+    write_if_missing(directory + file_name, data)
+    write_if_missing(directory + file_name + ".gz", gzip.compress(data, 9, mtime=0))
+    if brotli is not None:
+        write_if_missing(directory + file_name + ".br", brotli.compress(data))
+    return file_name
+
+def write_area(area_prefix, bundles):
+    directory = BUNDLES_DIR + area_prefix + "/"
+    os.makedirs(directory, exist_ok=True)
+    files = {name: write_bundle(directory, name, data) for name, data in sorted(bundles.items())}
+    manifest = encode({'area': area_prefix, 'files': files})
+    manifest_file = directory + MANIFEST_FILE
+    if os.path.exists(manifest_file):
+        with open(manifest_file, 'rb') as f:
+            if f.read() == manifest:
+                manifest = None
+    if manifest is not None:
+        with open(manifest_file + '.tmp', 'wb') as f:
+            f.write(manifest)
+        os.replace(manifest_file + '.tmp', manifest_file)
+    # Apaga os arquivos de pacotes antigos
+    current = set(files.values())
+    for entry in os.scandir(directory):
+        base = entry.name
+        for suffix in (".gz", ".br"):
+            if base.endswith(suffix):
+                base = base[:-len(suffix)]
+        if base != MANIFEST_FILE and base not in current:
+            os.remove(entry.path)
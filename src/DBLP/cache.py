@@ -0,0 +1,363 @@
+# Cache em disco compartilhado pelos scripts que buscam dados na rede (DBLP, arXiv, Semantic Scholar)
+#
+# FileCache guarda um arquivo por chave (ex: data/cache/dblp/<prof>.xml). Um índice na mesma pasta
+# (cache-index.json) guarda, para cada arquivo, o tamanho, o sha1 do conteúdo, quando foi gravado
+# ou revalidado ("stored"), o último acesso e metadados do servidor (ex: ETag). Arquivos
+# colocados ou alterados fora do cache são reconhecidos pelo tamanho e mtime.
+#
+# LogCache guarda valores curtos em um único arquivo de log (chave,valor,stored[,acesso]); cada
+# put acrescenta linhas ao log na hora, e o log é reescrito (compactado) quando tem linhas
+# repetidas demais.
+#
+# As duas classes têm a mesma API: get(chave, max_age), put, touch, contains, delete, stats,
+# evict e flush. max_age (segundos) faz um valor antigo contar como ausente; max_bytes (FileCache)
+# e max_entries (LogCache) limitam o cache, descartando primeiro o que foi usado há mais tempo.
+#
+# How to use (from src/DBLP):
+# python cache.py                 (estatísticas de todos os caches)
+# python cache.py --max-mb 500    (descarta os arquivos usados há mais tempo até cada cache ter até 500 MB)
+
+import os
+import csv
+import json
+import time
+import hashlib
+import argparse
+import threading
+
+INDEX_FILE = 'cache-index.json'
+
+def write_atomic(file, data):
+    # Escreve em um arquivo temporário e renomeia, para nunca deixar um arquivo pela metade no cache
+    tmp = file + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, file)
+
+def is_expired(stored, max_age, now=None):
+    if max_age is None:
+        return False
+    if now is None:
+        now = time.time()
+    return now - stored > max_age
+
+class FileCache:
+    def __init__(self, directory, suffix, max_bytes=None):
+        self.directory = directory
+        self.suffix = suffix
+        self.max_bytes = max_bytes
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.puts = 0
+        self.evictions = 0
+        self.dirty = False
+        self.entries = self.load_index()
+
+    def get_file_name(self, key):
+        return self.directory + key + self.suffix
+
+    def read_index(self):
+        file = self.directory + INDEX_FILE
+        if not os.path.exists(file):
+            return {}
+        with open(file, encoding='utf-8') as f:
+            try:
+                return json.load(f)
+            except ValueError:
+                return {}
+
+    def load_index(self):
+        # Junta o índice salvo com os arquivos que estão de fato na pasta
+        index = self.read_index()
+        entries = {}
+        if os.path.isdir(self.directory):
+            for file in os.scandir(self.directory):
+                # O próprio índice (cache-index.json, com o mesmo sufixo no cache do Scholar) e os
+                # arquivos .tmp de uma gravação em andamento não são entradas
+                if file.name == INDEX_FILE or file.name.endswith('.tmp') or not file.name.endswith(self.suffix):
+                    continue
+                key = file.name[:-len(self.suffix)]
+                stat = file.stat()
+                entry = index.get(key)
+                if entry is None or entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime_ns:
+                    # Arquivo novo ou alterado fora do cache: metadados do servidor não valem mais
+                    entry = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'sha1': None,
+                             'stored': stat.st_mtime, 'accessed': stat.st_mtime, 'meta': {}}
+                    self.dirty = True
+                entries[key] = entry
+        if len(entries) != len(index):
+            self.dirty = True
+        return entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def keys(self):
+        return list(self.entries)
+
+    def contains(self, key, max_age=None):
+        entry = self.entries.get(key)
+        return entry is not None and not is_expired(entry['stored'], max_age)
+
+    def get(self, key, max_age=None):
+        # Conteúdo (bytes) do arquivo, ou None se não está no cache ou é mais antigo que max_age
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if is_expired(entry['stored'], max_age):
+                self.expired += 1
+                return None
+            self.hits += 1
+            entry['accessed'] = time.time()
+            self.dirty = True
+        with open(self.get_file_name(key), 'rb') as f:
+            return f.read()
+
+    def get_meta(self, key):
+        entry = self.entries.get(key)
+        return dict(entry['meta']) if entry is not None else {}
+
+    def put(self, key, data, meta=None):
+        file = self.get_file_name(key)
+        os.makedirs(self.directory, exist_ok=True)
+        write_atomic(file, data)
+        stat = os.stat(file)
+        now = time.time()
+        with self.lock:
+            self.entries[key] = {'size': stat.st_size, 'mtime': stat.st_mtime_ns,
+                                 'sha1': hashlib.sha1(data).hexdigest(),
+                                 'stored': now, 'accessed': now, 'meta': meta or {}}
+            self.puts += 1
+            self.dirty = True
+        if self.max_bytes is not None:
+            self.evict()
+
+    def touch(self, key, meta=None):
+        # O servidor confirmou que o conteúdo não mudou: conta como gravado agora
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return
+            entry['stored'] = time.time()
+            if meta is not None:
+                entry['meta'] = meta
+            self.dirty = True
+
+    def sha1(self, key):
+        # sha1 do conteúdo, calculado só quando o arquivo muda
+        entry = self.entries[key]
+        if entry['sha1'] is None:
+            with open(self.get_file_name(key), 'rb') as f:
+                entry['sha1'] = hashlib.sha1(f.read()).hexdigest()
+            self.dirty = True
+        return entry['sha1']
+
+    def delete(self, key):
+        with self.lock:
+            if self.entries.pop(key, None) is None:
+                return
+            self.dirty = True
+        if os.path.exists(self.get_file_name(key)):
+            os.remove(self.get_file_name(key))
+
+    def size(self):
+        return sum(entry['size'] for entry in self.entries.values())
+
+    def evict(self, max_bytes=None):
+        # Descarta os arquivos usados há mais tempo até o cache caber em max_bytes
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        if max_bytes is None:
+            return
+        with self.lock:
+            total = self.size()
+            for key in sorted(self.entries, key=lambda k: self.entries[k]['accessed']):
+                if total <= max_bytes:
+                    break
+                total -= self.entries[key]['size']
+                self.delete(key)
+                self.evictions += 1
+
+    def stats(self):
+        return {'directory': self.directory, 'entries': len(self.entries), 'bytes': self.size(),
+                'hits': self.hits, 'misses': self.misses, 'expired': self.expired,
+                'puts': self.puts, 'evictions': self.evictions}
+
+    def flush(self):
+        # Grava o índice (tamanhos, sha1, datas e metadados)
+        with self.lock:
+            if not self.dirty or not os.path.isdir(self.directory):
+                return
+            write_atomic(self.directory + INDEX_FILE, json.dumps(self.entries, indent=1).encode('utf-8'))
+            self.dirty = False
+
+class LogCache:
+    def __init__(self, file, max_entries=None):
+        self.file = file
+        self.max_entries = max_entries
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.puts = 0
+        self.evictions = 0
+        self.entries = {}           # chave -> [valor, stored, último acesso]
+        self.lines = 0              # Linhas do log, para saber quando compactar
+        self.compact_needed = False
+        self.load()
+
+    def repair(self):
+        # Descarta uma última linha incompleta (execução interrompida no meio de uma escrita)
+        with open(self.file, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+
+    def load(self):
+        if not os.path.exists(self.file):
+            return
+        self.repair()
+        with open(self.file, encoding='utf-8', newline='') as f:
+            for line in csv.reader(f):
+                self.lines += 1
+                if len(line) >= 3 and line[2].isdigit():
+                    stored = int(line[2])
+                    accessed = int(line[3]) if len(line) >= 4 and line[3].isdigit() else stored
+                    self.entries[line[0]] = [line[1], stored, accessed]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def keys(self):
+        return list(self.entries)
+
+    def contains(self, key, max_age=None):
+        entry = self.entries.get(key)
+        return entry is not None and not is_expired(entry[1], max_age)
+
+    def get(self, key, max_age=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if is_expired(entry[1], max_age):
+                self.expired += 1
+                return None
+            self.hits += 1
+            entry[2] = int(time.time())
+            return entry[0]
+
+    def write_lines(self, f, items):
+        # Mesmo formato lido por load (csv): chaves ou valores com vírgula ou aspas ficam entre aspas
+        writer = csv.writer(f, lineterminator='\n')
+        for key, (value, stored, accessed) in items:
+            if accessed != stored:
+                writer.writerow((key, value, stored, accessed))
+            else:
+                writer.writerow((key, value, stored))
+
+    def put_many(self, items):
+        # Acrescenta os valores ao log e só retorna depois que eles estão gravados no disco
+        now = int(time.time())
+        items = [(key, [value, now, now]) for key, value in items]
+        with self.lock:
+            os.makedirs(os.path.dirname(self.file) or '.', exist_ok=True)
+            with open(self.file, 'a', encoding='utf-8', newline='') as f:
+                self.write_lines(f, items)
+                f.flush()
+                os.fsync(f.fileno())
+            self.entries.update(items)
+            self.lines += len(items)
+            self.puts += len(items)
+        if self.max_entries is not None and len(self.entries) > self.max_entries:
+            self.evict()
+
+    def put(self, key, value):
+        self.put_many([(key, value)])
+
+    def seed(self, key, value, stored):
+        # Valor vindo de outro lugar (ex: cache antigo); só entra no log na próxima compactação
+        if key not in self.entries:
+            self.entries[key] = [value, stored, stored]
+            self.compact_needed = True
+
+    def touch(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.put(key, entry[0])
+
+    def delete(self, key):
+        with self.lock:
+            if self.entries.pop(key, None) is not None:
+                self.compact_needed = True
+
+    def size(self):
+        return os.path.getsize(self.file) if os.path.exists(self.file) else 0
+
+    def evict(self, max_entries=None):
+        # Descarta os valores usados há mais tempo até o cache ter no máximo max_entries
+        if max_entries is None:
+            max_entries = self.max_entries
+        if max_entries is None:
+            return
+        with self.lock:
+            extra = len(self.entries) - max_entries
+            for key in sorted(self.entries, key=lambda k: self.entries[k][2])[:max(0, extra)]:
+                del self.entries[key]
+                self.evictions += 1
+                self.compact_needed = True
+
+    def compact(self):
+        # Reescreve o log com uma linha por chave
+        with self.lock:
+            tmp = self.file + '.tmp'
+            with open(tmp, 'w', encoding='utf-8', newline='') as f:
+                self.write_lines(f, self.entries.items())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.file)
+            self.lines = len(self.entries)
+            self.compact_needed = False
+
+    def stats(self):
+        return {'file': self.file, 'entries': len(self.entries), 'bytes': self.size(),
+                'hits': self.hits, 'misses': self.misses, 'expired': self.expired,
+                'puts': self.puts, 'evictions': self.evictions}
+
+    def flush(self):
+        # As entradas novas já estão no log; compacta quando as linhas repetidas passam de metade
+        # do log ou quando há entradas que ainda não estão nele
+        if self.compact_needed or self.lines > 2 * len(self.entries):
+            self.compact()
+
+def format_stats(name, stats):
+    return (f"{name:<10} {stats['entries']:>7} entries {stats['bytes'] / 2**20:>9.1f} MB  "
+            f"hits {stats['hits']}, misses {stats['misses']}, expired {stats['expired']}, "
+            f"puts {stats['puts']}, evictions {stats['evictions']}")
+
+def get_all_caches():
+    # Os caches dos scripts, pelo nome
+    return {
+        'dblp': FileCache('../../data/cache/dblp/', '.xml'),
+        'scholar': FileCache('../../data/cache/scholar/', '.json'),
+        'arxiv': LogCache('../../data/cache/arxiv/arxiv-cache.csv'),
+    }
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Mostra o uso dos caches e descarta os arquivos mais antigos")
+    parser.add_argument("--max-mb", type=float, help="tamanho máximo de cada cache de arquivos, em MB")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    for name, cache in get_all_caches().items():
+        if args.max_mb is not None and isinstance(cache, FileCache):
+            cache.evict(int(args.max_mb * 2**20))
+        cache.flush()
+        print(format_stats(name, cache.stats()))
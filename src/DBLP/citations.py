@@ -0,0 +1,177 @@
+# Número de citações dos artigos, a partir do cache do Semantic Scholar (data/cache/scholar)
+#
+# load_index() lê uma vez todos os JSONs do cache (um por autor, gravados pelo src/scholar, e o
+# papers-by-doi.json gravado aqui) e monta um índice por DOI e por título. O search.py consulta o
+# índice para todos os artigos de uma vez, depois da contagem: primeiro pelo DOI, depois pelo
+# título normalizado e, por último, pela busca aproximada do TitleIndex (só montada se precisar).
+#
+# fetch_missing() busca no Semantic Scholar só os DOIs que não estão no cache, em lotes de até
+# BATCH_SIZE artigos, com um número limitado de requisições simultâneas e por segundo.
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from dblp import TokenBucket, get_retry_wait
+import cache
+import titles
+
+SCHOLAR_DIR = '../../data/cache/scholar/'
+DOI_KEY = 'papers-by-doi'        # Artigos buscados por DOI, guardados ao lado dos JSONs dos autores
+API_URL = "https://api.semanticscholar.org/graph/v1/paper/batch"
+FIELDS = "title,year,citationCount,externalIds"
+BATCH_SIZE = 500                # Máximo de artigos por requisição da API
+MAX_RETRIES = 5
+TIMEOUT = 60
+
+def get_doi_key(doi):
+    # "https://doi.org/10.1145/X" -> "10.1145/x"
+    if not isinstance(doi, str):
+        return None
+    doi = doi.strip().lower()
+    for prefix in ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "http://dx.doi.org/"):
+        if doi.startswith(prefix):
+            return doi[len(prefix):]
+    return doi if doi.startswith("10.") else None
+
+def as_year(year):
+    try:
+        return int(year)
+    except (TypeError, ValueError):
+        return None
+
+class CitationIndex:
+    def __init__(self):
+        self.by_doi = {}            # DOI -> citações
+        self.by_title = {}          # título normalizado -> (citações, ano)
+        self.title_index = None     # TitleIndex dos títulos, montado na primeira busca aproximada
+        self.missing = set()        # DOIs que o Semantic Scholar não conhece
+
+    def add(self, paper):
+        count = paper.get('citationCount')
+        if count is None:
+            return
+        # O mesmo artigo aparece no JSON de cada coautor, com contagens de datas diferentes
+        doi = get_doi_key((paper.get('externalIds') or {}).get('DOI'))
+        if doi is not None:
+            self.by_doi[doi] = max(count, self.by_doi.get(doi, 0))
+        title = titles.normalize_title(paper.get('title') or "")
+        if title:
+            old = self.by_title.get(title)
+            self.by_title[title] = (max(count, old[0]) if old else count, as_year(paper.get('year')))
+            self.title_index = None
+
+    def find_title(self, title, year):
+        normalized = titles.normalize_title(title)
+        entry = self.by_title.get(normalized)
+        if entry is None:
+            if self.title_index is None:
+                self.title_index = titles.TitleIndex()
+                for t in self.by_title:
+                    self.title_index.add(t, t)
+            match = self.title_index.find(normalized)
+            if match is None:
+                return None
+            entry = self.by_title[match[0]]
+        # Títulos genéricos ("Editorial") só valem se o ano também bate
+        if year is not None and entry[1] is not None and abs(entry[1] - year) > 1:
+            return None
+        return entry[0]
+
+    def get(self, doi, title, year):
+        # Citações do artigo, ou None se ele não está no cache
+        doi = get_doi_key(doi)
+        if doi in self.by_doi:
+            return self.by_doi[doi]
+        return self.find_title(title, as_year(year))
+
+def read_json(scholar_cache, key):
+    data = scholar_cache.get(key)
+    if data is None:
+        return {}
+    try:
+        return json.loads(data)
+    except ValueError:
+        print("Invalid JSON: " + scholar_cache.get_file_name(key))
+        return {}
+
+def load_index(scholar_cache=None):
+    if scholar_cache is None:
+        scholar_cache = cache.FileCache(SCHOLAR_DIR, '.json')
+    index = CitationIndex()
+    for key in sorted(scholar_cache.keys()):
+        data = read_json(scholar_cache, key)
+        if not isinstance(data, dict):
+            continue
+        for paper in data.get('data') or []:
+            index.add(paper)
+        index.missing.update(data.get('missing', []))
+    return index
+
+def save_doi_file(scholar_cache, papers, missing):
+    data = {'data': papers, 'missing': sorted(missing)}
+    scholar_cache.put(DOI_KEY, json.dumps(data, indent=2).encode('utf-8'))
+
+class Client:
+    # A API pública do Semantic Scholar aceita cerca de uma requisição por segundo sem chave
+    def __init__(self, url=API_URL, rate=1.0, workers=2):
+        self.url = url
+        self.bucket = TokenBucket(rate)
+        self.workers = workers
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get_papers(self, dois):
+        # Retorna um item (ou None, se o DOI não existe lá) por DOI, ou None se a requisição falhou
+        response = None
+        for attempt in range(MAX_RETRIES):
+            self.bucket.acquire()
+            try:
+                response = self.session.post(self.url, params={'fields': FIELDS},
+                                             json={'ids': ['DOI:' + doi for doi in dois]}, timeout=TIMEOUT)
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code != 429 and response.status_code < 500:
+                    print(f"Semantic Scholar: HTTP {response.status_code}")
+                    return None
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"Semantic Scholar: {e}")
+                response = None
+            if attempt < MAX_RETRIES - 1:  # Não espera depois da última tentativa
+                time.sleep(get_retry_wait(response, attempt))
+        return None
+
+def fetch_missing(index, dois, client=None, scholar_cache=None):
+    # Busca os DOIs que não estão no índice nem foram dados como inexistentes; retorna quantos vieram
+    dois = sorted(set(d for d in map(get_doi_key, dois)
+                      if d is not None and d not in index.by_doi and d not in index.missing))
+    if not dois:
+        return 0
+    if client is None:
+        client = Client()
+    if scholar_cache is None:
+        scholar_cache = cache.FileCache(SCHOLAR_DIR, '.json')
+    saved = read_json(scholar_cache, DOI_KEY)
+    papers = saved.get('data', [])
+    missing = set(saved.get('missing', []))
+    batches = [dois[i:i + BATCH_SIZE] for i in range(0, len(dois), BATCH_SIZE)]
+    found = 0
+    with ThreadPoolExecutor(client.workers) as pool:
+        for batch, result in zip(batches, pool.map(client.get_papers, batches)):
+            if result is None:
+                continue
+            for doi, paper in zip(batch, result):
+                if paper is None:
+                    missing.add(doi)
+                    index.missing.add(doi)
+                    continue
+                # Guarda o DOI pedido, mesmo que a resposta não traga externalIds
+                paper['externalIds'] = dict(paper.get('externalIds') or {}, DOI=doi)
+                papers.append(paper)
+                index.add(paper)
+                found += 1
+            save_doi_file(scholar_cache, papers, missing)
+    scholar_cache.flush()
+    return found
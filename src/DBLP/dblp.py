@@ -1,34 +1,141 @@
-# How to use (from data folder):
-# python ../dblp.py
-# python ../dblp.py -test (only test the cached files)
+# How to use (from src/DBLP folder):
+# python dblp.py
+# python dblp.py --workers 4 --rate 1 (4 threads, no máximo 1 requisição por segundo)
+# python dblp.py --url http://localhost:8000/pid/ (usa um servidor local no lugar da DBLP)
+# python dblp.py --max-age 24 (só consulta arquivos que não foram baixados/revalidados nas últimas 24 horas)
+# python dblp.py -test (only test the cached files)
 
-import os
 import sys
 import time
 import csv
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import xmltodict
+import records
+import cache
 
-def is_in_cache(prof):
-    file = '../../data/cache/dblp/' + prof + '.xml'
-    return os.path.exists(file)
+CACHE_DIR = '../../data/cache/dblp/'
+DBLP_URL = "https://dblp.org/pid/"
+MAX_RETRIES = 5
+RETRY_STATUS = (429, 500, 502, 503, 504)
 
-def save_cache(prof, bibfile):
-    file = '../../data/cache/dblp/' + prof + '.xml'  
-    with open(file, 'w', encoding='utf-8') as f:
-        f.write(str(bibfile))
+# XMLs e metadados do servidor (ETag/Last-Modified) ficam no cache compartilhado
+CACHE = cache.FileCache(CACHE_DIR, '.xml')
+
+def is_in_cache(prof, max_age=None):
+    return CACHE.contains(prof, max_age)
+
+def save_cache(prof, bibfile, meta=None):
+    if isinstance(bibfile, str):
+        bibfile = bibfile.encode('utf-8')
+    CACHE.put(prof, bibfile, meta)
 
 def read_cache(prof):
-    file = '../../data/cache/dblp/' + prof + '.xml'  
-    with open(file) as f:
-            return f.read()
+    return CACHE.get(prof).decode('utf-8')
+
+def read_cache_bytes(prof):
+    return CACHE.get(prof)
+
+def get_meta(response):
+    meta = {}
+    if 'ETag' in response.headers:
+        meta['etag'] = response.headers['ETag']
+    if 'Last-Modified' in response.headers:
+        meta['last_modified'] = response.headers['Last-Modified']
+    return meta
+
+class TokenBucket:
+    # Limite de requisições por segundo compartilhado entre todas as threads
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            # Reserva o token mesmo que ele ainda não exista; a espera é proporcional à dívida
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+def get_retry_wait(response, attempt):
+    # Respeita o Retry-After do servidor; caso contrário usa backoff exponencial
+    if response is not None and 'Retry-After' in response.headers:
+        try:
+            return float(response.headers['Retry-After'])
+        except ValueError:
+            pass
+    return 2 ** attempt
+
+class Crawler:
+    def __init__(self, url=DBLP_URL, rate=1.0, workers=4):
+        self.url = url
+        self.bucket = TokenBucket(rate)
+        self.workers = workers
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, pid, headers):
+        response = None
+        for attempt in range(MAX_RETRIES):
+            self.bucket.acquire()
+            try:
+                response = self.session.get(self.url + pid + ".xml", headers=headers, timeout=180)
+                if response.status_code not in RETRY_STATUS:
+                    return response
+            except requests.exceptions.RequestException as e:
+                print(f"{pid}: {e}")
+                response = None
+            if attempt < MAX_RETRIES - 1:  # Não espera depois da última tentativa
+                time.sleep(get_retry_wait(response, attempt))
+        return response
+
+    def fetch(self, pid, prof, max_age=None):
+        # Retorna "new", "updated", "unchanged", "fresh" (revalidado há menos de max_age segundos) ou "failed"
+        if max_age is not None and is_in_cache(prof, max_age):
+            return "fresh"
+        cached = is_in_cache(prof)
+        meta = CACHE.get_meta(prof) if cached else {}
+        headers = {}
+        if 'etag' in meta:
+            headers['If-None-Match'] = meta['etag']
+        if 'last_modified' in meta:
+            headers['If-Modified-Since'] = meta['last_modified']
+
+        response = self.get(pid, headers)
+        if response is None:
+            return "failed"
+        if response.status_code == 304:
+            CACHE.touch(prof)
+            return "unchanged"
+        if response.status_code != 200:
+            print(f"{pid}: HTTP {response.status_code}")
+            return "failed"
+
+        new_meta = get_meta(response)
+        if cached and read_cache_bytes(prof) == response.content:
+            # Mesmo conteúdo: não reescreve o XML, só guarda os cabeçalhos para a próxima vez
+            CACHE.touch(prof, new_meta)
+            return "unchanged"
+        save_cache(prof, response.content, new_meta)
+        return "updated" if cached else "new"
 
 def crawl_dblp(pid):
     try:
-        url = "http://dblp.org/pid/" + pid + ".xml"
+        url = DBLP_URL + pid + ".xml"
         return requests.get(url, timeout=180).text
     except requests.Timeout:
-        print("Request timed out after 180 seconds")     
+        print("Request timed out after 180 seconds")
     except requests.exceptions.RequestException as e:
         print (e)
         sys.exit(1)
@@ -45,22 +152,30 @@ def parse_dblp(_, dblp):
         return True
     return True
 
-def download_all_prof_data():
+def download_all_prof_data(crawler, max_age=None):
     start_time = time.time()
     reader = csv.reader(open("../../data/configs/all-researchers.csv", 'r'))
-    count = 1;
-    for researcher in reader:
-        prof, department, pid = researcher
-        print(f"{count} > {prof}, {department}")
-        prof = prof.replace(" ", "-")
-    
-        bibfile = get_dblp_file(pid, prof)
-        save_cache(prof, bibfile)
+    researchers = [(prof.replace(" ", "-"), department, pid.strip()) for prof, department, pid in reader]
 
-        time.sleep(2)
-        count = count + 1
+    def fetch(researcher):
+        prof, _, pid = researcher
+        return crawler.fetch(pid, prof, max_age)
+
+    failed = []
+    with ThreadPoolExecutor(crawler.workers) as pool:
+        count = 1
+        for (prof, department, _), status in zip(researchers, pool.map(fetch, researchers)):
+            print(f"{count} > {prof}, {department}: {status}")
+            if status == "failed":
+                failed.append(prof)
+            count = count + 1
+    CACHE.flush()
     elapsed_time = round((time.time() - start_time) / 60, 2)
     print(f"Elapsed time (min): {elapsed_time}")
+    print(cache.format_stats("dblp", CACHE.stats()))
+    if failed:
+        print("Failed: " + ", ".join(failed))
+        sys.exit(1)
 
 def test_all_prof_data():
     print ("Testing files ....")
@@ -70,12 +185,27 @@ def test_all_prof_data():
         prof, department, pid = researcher
         print(f"{count} > {prof}, {department}")
         prof = prof.replace(" ", "-")
-        bibfile = get_dblp_file(pid, prof)
-        xmltodict.parse(bibfile, item_depth=3, item_callback=parse_dblp)
+        if is_in_cache(prof):
+            # Também (re)gera o cache pré-processado dos registros
+            records.load_records(CACHE.get_file_name(prof))
+        else:
+            bibfile = crawl_dblp(pid)
+            xmltodict.parse(bibfile, item_depth=3, item_callback=parse_dblp)
         count = count + 1
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Baixa os arquivos XML dos pesquisadores na DBLP")
+    parser.add_argument("-test", action="store_true", help="only test the cached files")
+    parser.add_argument("--workers", type=int, default=4, help="número de downloads simultâneos")
+    parser.add_argument("--rate", type=float, default=1.0, help="máximo de requisições por segundo")
+    parser.add_argument("--url", default=DBLP_URL, help="endereço base dos arquivos <pid>.xml")
+    parser.add_argument("--max-age", type=float,
+                        help="não consulta a DBLP para arquivos baixados ou revalidados há menos de tantas horas")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    download = len(sys.argv) < 2 or sys.argv[1] != "-test"
-    if download:
-        download_all_prof_data()
-    test_all_prof_data()
\ No newline at end of file
+    args = parse_args()
+    if not args.test:
+        max_age = args.max_age * 3600 if args.max_age is not None else None
+        download_all_prof_data(Crawler(args.url, args.rate, args.workers), max_age)
+    test_all_prof_data()
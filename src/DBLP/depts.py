@@ -0,0 +1,144 @@
+# Indicadores dos departamentos em todas as áreas, usados pelo robdepts.py
+#
+# Lê uma vez os <area>-out-scores.csv de todas as áreas configuradas e o número de professores de
+# cada departamento (profs.csv, gravado pelo runprofs.py) e monta uma tabela indexada: cada
+# departamento tem um id (papers.Names) e um vetor com a pontuação em cada área. A partir dela são
+# calculados, sem percorrer listas:
+#   total        soma das pontuações nas áreas
+#   per_capita   total dividido pelo número de professores
+#   normalized   pontuação na área dividida pela maior pontuação da área (0 a 1)
+#   ranks        posição no ranking de cada área (0 se o departamento não pontuou na área)
+#   rank e per_capita_rank: posição nos rankings do total e do total por professor
+# write_depts() grava tudo em depts.json (com um índice slug -> posição) e, para os departamentos
+# com ao menos MIN_PROFS professores, o depts.html e o scores-<slug>.csv de cada um.
+#
+# How to use (from src/DBLP, depois do search.py e do runprofs.py):
+# python robdepts.py
+
+import csv
+import os
+from array import array
+import papers
+import scoring
+import bundles
+
+DATA_DIR = '../../data/'
+OUTPUT_DIR = '../../data/depts/'
+MIN_PROFS = 10                  # Departamentos com menos professores não têm página
+
+def get_dept_slug(dept):
+    # "COPPE/UFRJ" -> "coppeufrj", como nos links depts.html?d=
+    return dept.replace("/", "").replace(" ", "").lower()
+
+class DeptTable:
+    def __init__(self, areas):
+        self.areas = list(areas)
+        self.depts = papers.Names()
+        self.scores = []                # Id do departamento -> array('d') com a pontuação em cada área
+        self.profs = array('I')         # Id do departamento -> número de professores
+
+    def __len__(self):
+        return len(self.depts)
+
+    def get_id(self, dept):
+        i = self.depts.get_id(dept)
+        if i == len(self.scores):
+            self.scores.append(array('d', bytes(8 * len(self.areas))))
+            self.profs.append(0)
+        return i
+
+    def get_totals(self):
+        return [sum(scores) for scores in self.scores]
+
+    def get_per_capita(self, totals):
+        return [t / n if n > 0 else 0.0 for t, n in zip(totals, self.profs)]
+
+    def get_normalized(self):
+        # Pontuação de cada departamento dividida pela maior da área
+        top = [max((scores[a] for scores in self.scores), default=0.0) for a in range(len(self.areas))]
+        return [[s / m if m > 0 else 0.0 for s, m in zip(scores, top)] for scores in self.scores]
+
+    def get_ranks(self, values):
+        # Posição de cada departamento no ranking de values (0 se não pontuou), com a ordem de scoring.rank
+        ranks = [0] * len(self.depts)
+        ids = self.depts.ids
+        for position, (dept, value) in enumerate(scoring.rank(dict(zip(self.depts.names, values)))):
+            ranks[ids[dept]] = position + 1
+        return ranks
+
+    def get_area_ranks(self):
+        # ranks[dept][área]
+        by_area = [self.get_ranks([scores[a] for scores in self.scores]) for a in range(len(self.areas))]
+        return [list(ranks) for ranks in zip(*by_area)] if by_area else [[] for _ in self.scores]
+
+def read_areas():
+    reader = csv.reader(open(DATA_DIR + "configs/research-areas-config.csv", 'r', encoding="utf-8"))
+    return [a[0] for a in reader if a]
+
+def load_table(areas):
+    # Áreas sem <area>-out-scores.csv (ainda não processadas) ficam com pontuação 0
+    table = DeptTable(areas)
+    for a, area in enumerate(table.areas):
+        file_name = DATA_DIR + area + "-out-scores.csv"
+        if not os.path.exists(file_name):
+            continue
+        with open(file_name, encoding="utf-8", newline='') as f:
+            for row in csv.reader(f):
+                if len(row) >= 2:
+                    table.scores[table.get_id(row[0])][a] = float(row[1])
+    with open(DATA_DIR + "configs/profs/profs.csv", encoding="utf-8", newline='') as f:
+        for row in csv.reader(f):
+            if len(row) >= 2:
+                table.profs[table.get_id(row[1])] += 1
+    return table
+
+def get_dept_rows(table):
+    # Linhas de depts.json, em ordem alfabética de departamento
+    totals = table.get_totals()
+    per_capita = table.get_per_capita(totals)
+    normalized = table.get_normalized()
+    area_ranks = table.get_area_ranks()
+    ranks = table.get_ranks(totals)
+    per_capita_ranks = table.get_ranks(per_capita)
+    rows = []
+    for dept in sorted(table.depts.names):
+        i = table.depts.ids[dept]
+        rows.append({'dept': dept, 'slug': get_dept_slug(dept), 'profs': table.profs[i],
+                     'scores': list(table.scores[i]), 'normalized': [round(n, 4) for n in normalized[i]],
+                     'ranks': area_ranks[i], 'total': round(totals[i], 2), 'rank': ranks[i],
+                     'per_capita': round(per_capita[i], 4), 'per_capita_rank': per_capita_ranks[i]})
+    return rows
+
+def write_file_if_changed(file_name, text):
+    if os.path.exists(file_name):
+        with open(file_name, encoding="utf-8", newline='') as f:
+            if f.read() == text:
+                return
+    with open(file_name, 'w', encoding="utf-8", newline='') as f:
+        f.write(text)
+
+def write_scores(table, dept):
+    # scores-<slug>.csv: AREA,pontuação
+    scores = table.scores[table.depts.ids[dept]]
+    lines = []
+    for a, area in enumerate(table.areas):
+        lines.append(area.upper() + ',' + (str(scores[a]) if scores[a] else '0.00') + '\n')
+    write_file_if_changed(OUTPUT_DIR + 'scores-' + get_dept_slug(dept) + '.csv', "".join(lines))
+
+def write_depts(table):
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    rows = get_dept_rows(table)
+    index = {row['slug']: i for i, row in enumerate(rows)}
+    data = {'areas': table.areas, 'min_profs': MIN_PROFS, 'depts': rows, 'index': index}
+    write_file_if_changed(OUTPUT_DIR + 'depts.json', bundles.encode(data).decode('utf-8'))
+
+    # Lista de departamentos com página e as pontuações de cada um
+    html = ['<ul>\n']
+    for row in rows:
+        # Só departamentos que pontuaram em alguma área (rank > 0) e com professores suficientes
+        if row['rank'] == 0 or row['profs'] < MIN_PROFS:
+            continue
+        html.append('<li>  <a href="https://csindexbr.org/depts.html?d=' + row['slug'] + '">' + row['dept'] + '</a>\n')
+        write_scores(table, row['dept'])
+    html.append('</ul>\n')
+    write_file_if_changed(OUTPUT_DIR + 'depts.html', "".join(html))
@@ -0,0 +1,133 @@
+# Instrumentação opcional do search.py (--profile ou SEARCH_PROFILE=<arquivo>)
+#
+# Guarda o tempo de cada etapa e de cada arquivo de saída, o tempo de leitura de cada pesquisador
+# com os registros lidos, indexados e rejeitados por filtro (ano, local, lista negra, jornal de
+# classificação manual, número de páginas), e o tempo de rede e a taxa de acerto do cache do arXiv.
+# No fim, grava tudo em um relatório JSON e mostra um resumo.
+#
+# Sem --profile nada disso é medido: o search.py só chama estas funções quando Global.profile existe.
+
+import json
+import time
+import contextlib
+
+REPORT_FILE = '../../data/cache/search-profile.json'
+
+# Motivos de rejeição de um registro no filtro rápido ou em uma área (ver search.get_rejection)
+REJECTIONS = ('no_venue', 'year', 'venue', 'black_list', 'manual_journal', 'page_size')
+
+class Profile:
+    def __init__(self, report_file):
+        self.report_file = report_file
+        self.start = time.perf_counter()
+        self.stages = {}            # etapa -> segundos (somados, se a etapa roda mais de uma vez)
+        self.outputs = {}           # função de saída -> segundos
+        self.researchers = []       # um dicionário por pesquisador (primeiro os que vieram do manifesto)
+        self.arxiv = {'dois': 0, 'cached': 0, 'lookups': 0, 'resolved': 0, 'network_seconds': 0.0}
+        self.caches = {}
+        self.outside_window = {}    # área -> artigos indexáveis fora da janela de anos das saídas
+
+    @contextlib.contextmanager
+    def stage(self, name, table=None):
+        if table is None:
+            table = self.stages
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            table[name] = table.get(name, 0.0) + time.perf_counter() - start
+
+    def add_researcher(self, stats):
+        self.researchers.append(stats)
+
+    def get_totals(self):
+        # Soma, por área, os registros indexados e as rejeições de todos os pesquisadores lidos
+        totals = {'records': 0, 'prefiltered': {k: 0 for k in REJECTIONS[:3]}, 'parse_seconds': 0.0, 'areas': {}}
+        for r in self.researchers:
+            if r['cached']:
+                continue
+            totals['records'] += r['records']
+            for reason, n in r['prefiltered'].items():
+                totals['prefiltered'][reason] += n
+            totals['parse_seconds'] += r['seconds']
+            for area_prefix, area in r['areas'].items():
+                t = totals['areas'].setdefault(area_prefix, dict({'indexed': 0}, **{k: 0 for k in REJECTIONS}))
+                t['indexed'] += area['indexed']
+                for reason, n in area['rejections'].items():
+                    t[reason] += n
+        totals['parse_seconds'] = round(totals['parse_seconds'], 4)
+        return totals
+
+    def get_report(self):
+        arxiv = dict(self.arxiv)
+        arxiv['hit_rate'] = round(arxiv['cached'] / arxiv['dois'], 4) if arxiv['dois'] else None
+        arxiv['network_seconds'] = round(arxiv['network_seconds'], 4)
+        return {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'total_seconds': round(time.perf_counter() - self.start, 4),
+            'stages': {k: round(v, 4) for k, v in self.stages.items()},
+            'outputs': {k: round(v, 4) for k, v in self.outputs.items()},
+            'totals': self.get_totals(),
+            'outside_window': self.outside_window,
+            'arxiv': arxiv,
+            'caches': self.caches,
+            'researchers': self.researchers,
+        }
+
+    def write_report(self):
+        report = self.get_report()
+        with open(self.report_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print_summary(report)
+        print("Profile report: " + self.report_file)
+
+def print_summary(report):
+    print("Stages (s):")
+    for name, seconds in report['stages'].items():
+        print(f"  {name:<28} {seconds:9.3f}")
+    print("Outputs (s):")
+    for name, seconds in sorted(report['outputs'].items(), key=lambda x: x[1], reverse=True):
+        print(f"  {name:<28} {seconds:9.3f}")
+    totals = report['totals']
+    print(f"Records: {totals['records']} read, outside every area: "
+          + ", ".join(f"{k} {v}" for k, v in totals['prefiltered'].items()))
+    for area_prefix, t in totals['areas'].items():
+        print(f"  {area_prefix}: " + ", ".join(f"{k} {v}" for k, v in t.items())
+              + f", outside the output years {report['outside_window'].get(area_prefix, 0)}")
+    parsed = [r for r in report['researchers'] if not r['cached']]
+    print(f"Researchers: {len(parsed)} parsed, {len(report['researchers']) - len(parsed)} from the manifest")
+    for r in sorted(parsed, key=lambda r: r['seconds'], reverse=True)[:10]:
+        print(f"  {r['seconds']:8.3f} s  {r['records']:6} records  {r['prof']}")
+    arxiv = report['arxiv']
+    print(f"arXiv: {arxiv['dois']} DOIs, hit rate {arxiv['hit_rate']}, {arxiv['lookups']} looked up "
+          f"in {arxiv['network_seconds']:.3f} s")
+
+@contextlib.contextmanager
+def code_profiler(file):
+    # Perfil de todas as funções: pyinstrument (se instalado) para arquivos .html, cProfile (pstats) para os demais
+    if file is None:
+        yield
+        return
+    if file.endswith('.html'):
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("pyinstrument is not installed; use a .prof file for cProfile")
+            raise
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(file, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+        return
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(file)
@@ -0,0 +1,65 @@
+# Manifesto da última execução do search.py, usado para reprocessar só os pesquisadores que mudaram
+#
+# Para cada pesquisador o manifesto guarda o pid, o sha1 do XML da DBLP e, para cada área, o hash
+# da configuração usada (conferências, listas, anos) junto com os artigos indexáveis encontrados e
+# as falhas de classificação manual. Se o XML e a configuração da área não mudaram, esses
+# resultados são reaproveitados e o XML não é lido de novo.
+
+import os
+import marshal
+import hashlib
+
+MANIFEST_FILE = '../../data/cache/search-manifest.bin'
+VERSION = 1
+
+def get_config_hash(*config):
+    # Hash estável de uma configuração (dicionários são ordenados antes)
+    def normalize(value):
+        if isinstance(value, dict):
+            return sorted((k, normalize(v)) for k, v in value.items())
+        if isinstance(value, (set, frozenset)):
+            return sorted(normalize(v) for v in value)
+        if isinstance(value, (list, tuple)):
+            return [normalize(v) for v in value]
+        return value
+    return hashlib.sha1(repr(normalize(config)).encode('utf-8')).hexdigest()
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+    with open(MANIFEST_FILE, 'rb') as f:
+        try:
+            version, researchers = marshal.load(f)
+        except (EOFError, ValueError, TypeError):
+            return {}
+    if version != VERSION:
+        return {}
+    return researchers
+
+def save_manifest(researchers):
+    tmp = MANIFEST_FILE + '.tmp'
+    with open(tmp, 'wb') as f:
+        marshal.dump((VERSION, researchers), f)
+    os.replace(tmp, MANIFEST_FILE)
+
+def get_cached_results(researchers, prof, pid, sha1, area_hashes):
+    # Retorna os resultados guardados de cada área, na ordem de area_hashes, ou None se algo mudou
+    entry = researchers.get(prof)
+    if entry is None or entry['pid'] != pid or entry['sha1'] != sha1:
+        return None
+    results = []
+    for area_prefix, config_hash in area_hashes:
+        cached = entry['areas'].get(area_prefix)
+        if cached is None or cached[0] != config_hash:
+            return None
+        results.append(cached[1:])
+    return results
+
+def update_entry(researchers, prof, pid, sha1, area_hashes, results):
+    entry = researchers.get(prof)
+    if entry is None or entry['pid'] != pid or entry['sha1'] != sha1:
+        # XML novo: os resultados de outras áreas deixam de valer
+        entry = {'pid': pid, 'sha1': sha1, 'areas': {}}
+        researchers[prof] = entry
+    for (area_prefix, config_hash), (hits, mc_failed_papers) in zip(area_hashes, results):
+        entry['areas'][area_prefix] = (config_hash, hits, mc_failed_papers)
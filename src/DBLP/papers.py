@@ -0,0 +1,98 @@
+# Tabela em memória dos artigos de uma área, usada pelo search.py
+#
+# Cada artigo é uma linha; os campos ficam em colunas separadas (arrays de inteiros para ano, peso,
+# local e citações, listas para os textos). Locais e departamentos são guardados uma única vez e
+# referenciados por um id. Os departamentos de cada artigo formam um bitset (bit i = departamento
+# de id i), então saber se um departamento já tem o artigo, ou acrescentá-lo, não depende de
+# quantos departamentos o artigo já tem. A ordem em que os departamentos foram acrescentados, usada
+# nos CSVs, só é guardada à parte para os artigos com mais de um departamento.
+
+import sys
+from array import array
+
+class Names:
+    # Nomes (locais, departamentos) guardados uma vez só, cada um com um id sequencial
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def get_id(self, name):
+        i = self.ids.get(name)
+        if i is None:
+            i = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+class PaperTable:
+    def __init__(self):
+        self.rows = {}                  # URL -> linha
+        self.urls = []
+        self.years = array('H')
+        self.weights = array('B')       # Peso do local (define nível, tipo e pontuação)
+        self.venue_ids = array('I')     # Id do local em self.venues
+        self.titles = []                # Título entre aspas, como é gravado nos CSVs
+        self.authors = []               # Tupla de autores
+        self.dois = []
+        self.arxiv_urls = []
+        self.citations = array('i')
+        self.dept_bits = []             # Bitset dos departamentos do artigo
+        self.first_depts = array('I')   # Id do primeiro departamento do artigo
+        self.more_depts = {}            # Linha -> ids dos outros departamentos, na ordem em que entraram
+        self.venues = Names()
+        self.depts = Names()
+
+    def __len__(self):
+        return len(self.urls)
+
+    def __contains__(self, url):
+        return url in self.rows
+
+    def get_row(self, url):
+        return self.rows.get(url)
+
+    def add(self, url, year, venue, title, dept, authors, doi, weight, arxiv_url, citations=0):
+        # Acrescenta um artigo novo; retorna a linha
+        row = len(self.urls)
+        dept_id = self.depts.get_id(dept)
+        self.rows[url] = row
+        self.urls.append(url)
+        self.years.append(year)
+        self.weights.append(weight)
+        self.venue_ids.append(self.venues.get_id(venue))
+        self.titles.append('"' + title + '"')
+        self.authors.append(tuple(sys.intern(a) for a in authors))
+        self.dois.append(doi)
+        self.arxiv_urls.append(arxiv_url)
+        self.citations.append(citations)
+        self.dept_bits.append(1 << dept_id)
+        self.first_depts.append(dept_id)
+        return row
+
+    def has_dept(self, row, dept):
+        dept_id = self.depts.ids.get(dept)
+        return dept_id is not None and (self.dept_bits[row] >> dept_id) & 1 == 1
+
+    def add_dept(self, row, dept):
+        # Acrescenta um departamento ao artigo; retorna False se ele já estava lá
+        dept_id = self.depts.get_id(dept)
+        bit = 1 << dept_id
+        if self.dept_bits[row] & bit:
+            return False
+        self.dept_bits[row] |= bit
+        self.more_depts.setdefault(row, []).append(dept_id)
+        return True
+
+    def get_dept_ids(self, row):
+        ids = [self.first_depts[row]]
+        ids.extend(self.more_depts.get(row, ()))
+        return ids
+
+    def get_depts(self, row):
+        # Departamentos do artigo como são gravados nos CSVs ("A; B")
+        return "; ".join(self.depts.names[i] for i in self.get_dept_ids(row))
+
+    def get_venue(self, row):
+        return self.venues.names[self.venue_ids[row]]
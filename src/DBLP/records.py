@@ -0,0 +1,137 @@
+# Cache pré-processado dos registros da DBLP
+#
+# Cada XML em data/cache/dblp/<prof>.xml é convertido uma única vez em uma lista de registros
+# (um dicionário por artigo, só com os campos usados pelo search.py) e salvo com marshal em
+# data/cache/dblp-records/<prof>.bin. O arquivo guarda o mtime, o tamanho e o sha1 do XML de
+# origem; enquanto o XML não mudar, os registros são lidos direto do .bin, sem parse do XML.
+#
+# O XML é lido em streaming (iterparse): cada <r> é convertido e descartado em seguida, então a
+# memória não cresce com o tamanho do arquivo. Os valores seguem o formato do xmltodict.
+#
+# O .bin guarda todos os registros do pesquisador, sem filtro: o mesmo cache serve para qualquer
+# conjunto de áreas. O filtro (accept do load_records) é aplicado depois da leitura.
+
+import os
+import marshal
+import hashlib
+import xml.etree.ElementTree as ET
+
+RECORDS_DIR = '../../data/cache/dblp-records/'
+VERSION = 2
+
+# Campos mantidos de cada registro, com os mesmos nomes usados pelo xmltodict
+FIELDS = ('journal', 'booktitle', 'number', 'year', 'title', 'author', 'pages', 'ee', 'url')
+
+def get_element_value(elem):
+    # Mesmo valor que o xmltodict daria ao elemento: texto próprio (sem o texto dos filhos), ou
+    # um dicionário com '#text' quando o elemento tem atributos ou filhos
+    text = (elem.text or '') + ''.join(child.tail or '' for child in elem)
+    text = text.strip()
+    if elem.attrib or len(elem):
+        return {'#text': text} if text else {}
+    return text or None
+
+def get_text(value):
+    if isinstance(value, dict):
+        return value.get('#text', '')
+    return value
+
+def normalize_value(field, values):
+    # values: valores de todos os filhos com o mesmo nome, na ordem do XML
+    if field == 'author':
+        # Sempre uma lista de nomes
+        return [get_text(name) for name in values]
+    if field == 'title':
+        # Títulos com marcação continuam como dicionário, como no xmltodict
+        value = values[0] if len(values) == 1 else values
+        if isinstance(value, dict):
+            return {'#text': get_text(value)}
+        return value
+    # Demais campos: só o primeiro valor (ex: o primeiro link em 'ee' é o DOI)
+    return get_text(values[0])
+
+def make_record(kind, elem):
+    fields = {}
+    for child in elem:
+        if child.tag in FIELDS:
+            fields.setdefault(child.tag, []).append(child)
+    record = {'type': kind}
+    if 'key' in elem.attrib:
+        record['key'] = elem.attrib['key']
+    for field in FIELDS:
+        if field in fields:
+            record[field] = normalize_value(field, [get_element_value(c) for c in fields[field]])
+    return record
+
+def iter_records(xml_file):
+    # Lê os registros (filhos de <r>) de um XML da DBLP em streaming
+    path = []
+    root = None
+    for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            path.append(elem.tag)
+            continue
+        path.pop()
+        if len(path) == 2 and path[1] == 'r':
+            yield make_record(elem.tag, elem)
+        elif len(path) == 1:
+            # Fim de um filho de <dblpperson>: libera o que já foi lido
+            root.clear()
+
+def parse_records(xml_file):
+    # Converte o XML de um pesquisador em uma lista de registros
+    return list(iter_records(xml_file))
+
+def get_records_file_name(xml_file):
+    name = os.path.splitext(os.path.basename(xml_file))[0]
+    return RECORDS_DIR + name + '.bin'
+
+def file_sha1(file):
+    with open(file, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def read_records_file(records_file, xml_file):
+    # Retorna os registros do .bin se ele corresponde ao XML atual; senão retorna None
+    if not os.path.exists(records_file):
+        return None
+    stat = os.stat(xml_file)
+    with open(records_file, 'rb') as f:
+        try:
+            version, mtime, size, sha1 = marshal.load(f)
+        except (EOFError, ValueError, TypeError):
+            return None
+        if version != VERSION or size != stat.st_size:
+            return None
+        if mtime != stat.st_mtime_ns:
+            # O mtime mudou (ex: checkout do git); só reaproveita se o conteúdo for o mesmo
+            if sha1 != file_sha1(xml_file):
+                return None
+            records = marshal.load(f)
+            write_records_file(records_file, xml_file, records, sha1)
+            return records
+        return marshal.load(f)
+
+def write_records_file(records_file, xml_file, records, sha1=None):
+    os.makedirs(RECORDS_DIR, exist_ok=True)
+    stat = os.stat(xml_file)
+    if sha1 is None:
+        sha1 = file_sha1(xml_file)
+    tmp = records_file + '.tmp'
+    with open(tmp, 'wb') as f:
+        marshal.dump((VERSION, stat.st_mtime_ns, stat.st_size, sha1), f)
+        marshal.dump(records, f)
+    os.replace(tmp, records_file)
+
+def load_records(xml_file, accept=None):
+    # Lê os registros de um XML da DBLP, refazendo o cache só quando o XML mudou
+    # O cache guarda todos os registros; accept só filtra o que é retornado
+    records_file = get_records_file_name(xml_file)
+    records = read_records_file(records_file, xml_file)
+    if records is None:
+        records = parse_records(xml_file)
+        write_records_file(records_file, xml_file, records)
+    if accept is not None:
+        return [r for r in records if accept(r)]
+    return records
@@ -1,7 +1,9 @@
 import csv
-import glob
 import os
 
+PAPERS_DIR = "../../data/configs/profs/papers/"
+AREAS_FILE = "../../data/configs/profs/all-areas.csv"  # Gerado pelo search.py -all; não fica no repositório
+
 # Recebe o caminho do arquivo e retorna o número de linhas
 def file_size(file):
     try:
@@ -11,18 +13,33 @@ def file_size(file):
         with open(file, encoding="latin1") as f:
             return sum(1 for line in f)
 
-# Para cada professor, verifica o tamanho dos arquivos encontrados
-# Determina a área conforme o arquivo com maior número de linhas
-def get_area(prof):
+# Número de artigos de cada professor (nome com hífens) em cada área
+# Lido de all-areas.csv, gravado pelo search.py; sem ele, conta as linhas dos arquivos
+# <area>-<prof>-papers.csv, percorrendo a pasta uma única vez
+def read_prof_areas():
+    prof_areas = {}
+    if os.path.exists(AREAS_FILE):
+        with open(AREAS_FILE, encoding="utf-8", newline='') as f:
+            for row in csv.reader(f):
+                if len(row) == 3:
+                    prof_areas.setdefault(row[0].replace(" ", "-"), {})[row[1]] = int(row[2])
+        return prof_areas
+    for entry in os.scandir(PAPERS_DIR):
+        if not entry.name.endswith("-papers.csv") or '-' not in entry.name[:-len("-papers.csv")]:
+            continue
+        area, prof = entry.name[:-len("-papers.csv")].split('-', 1)
+        prof_areas.setdefault(prof, {})[area] = file_size(entry.path)
+    return prof_areas
+
+# Determina a área do professor conforme a área com maior número de artigos
+# (em caso de empate, a primeira em ordem alfabética)
+def get_area(prof_areas, prof):
     size = 0
     area = ""
-    files = glob.glob("../../data/configs/profs/papers/*" + prof + "-papers.csv")
-    for file in files:
-        size2 = file_size(file)
+    for area2, size2 in sorted(prof_areas.get(prof, {}).items()):
         if size2 > size:
             size = size2
-            basename = os.path.basename(file)  # Só o nome do arquivo
-            area = basename[:basename.index('-')]  # Pega até o primeiro '-'
+            area = area2
     return area.upper()
 
 # Função que cria o arquivo HTML individual de um professor, se ainda não existir
@@ -61,6 +78,9 @@ out2 = open('../../data/configs/profs/profs.csv', 'w', encoding="utf-8")  # Arqu
 with open(top_path, 'r', encoding="utf-8") as file1:
     out.write(file1.read())
 
+# Artigos por área de todos os professores, lidos uma única vez
+prof_areas = read_prof_areas()
+
 # Leitura dos nomes em all-authors.csv
 reader2 = csv.reader(open("../../data/configs/profs/all-authors.csv", 'r', encoding="utf-8"))
 for p in reader2:
@@ -69,7 +89,7 @@ for p in reader2:
     dept = inst[prof]
     
     # Aqui, chamamos a função get_area() para encontrar a área do professor
-    area = get_area(p2)
+    area = get_area(prof_areas, p2)
 
     # Escreve o nome do professor, com link para a página dele
     out.write('<li>  <a href="https://csindexbr.org/authors.html?p=' + p2 + '">')
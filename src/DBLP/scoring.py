@@ -0,0 +1,199 @@
+# Pontuações e rankings calculados sobre a tabela de artigos de uma área (papers.PaperTable)
+#
+# A pontuação de um artigo depende só do peso do local (1 a 7, de <area>-confs.csv). Em vez de
+# somar a pontuação a cada artigo encontrado, get_points() calcula de uma vez a coluna de pontos de
+# todos os artigos (uma consulta a uma tabela por peso), já zerando os artigos fora dos anos ou dos
+# níveis pedidos. As funções sum_by_* agrupam essa coluna por departamento (e por ano, nível ou
+# professor) e rank() ordena o resultado como os CSVs de saída. Assim, outro esquema de pesos ou
+# outra janela de anos é avaliado sobre todos os artigos sem reler os XMLs.
+#
+# How to use (from src/DBLP, depois do search.py):
+# python scoring.py cs                              (ranking dos departamentos, como cs-out-scores.csv)
+# python scoring.py cs --scheme top-only            (só artigos em locais top)
+# python scoring.py cs --years 2022 2024 --tiers top near-top --by year
+# python scoring.py robotics --by prof --top 20     (pontuação dos professores)
+
+import csv
+import os
+import time
+import argparse
+from array import array
+import papers
+
+# Pontuação de um artigo pelo peso do local
+SCHEMES = {
+    'default': {1: 1.0, 4: 1.0, 2: 0.66, 3: 0.33, 6: 0.33, 7: 0.33, 5: 0.4},
+    'top-only': {1: 1.0, 4: 1.0},
+    'flat': {1: 1.0, 2: 1.0, 3: 1.0, 4: 1.0, 5: 1.0, 6: 1.0, 7: 1.0},
+    'conferences': {1: 1.0, 2: 0.66, 3: 0.33},
+    'journals': {4: 1.0, 5: 0.4, 6: 0.33, 7: 0.33},
+}
+DEFAULT_SCHEME = SCHEMES['default']
+
+TIERS = ('top', 'near-top', 'null')
+MAX_WEIGHT = 255                # Os pesos ficam em um array('B')
+RANK_DIGITS = 9
+
+def get_venue_tier(weight):
+    # Retorna o "nível" do evento baseado no peso (classificação)
+    if (weight == 1) or (weight == 4):
+        return "top"  # Top venues
+    if weight == 2:
+        return "near-top"  # Near-top venues
+    return "null"  # Outros
+
+def get_venue_type(weight):
+    # Retorna o tipo do evento (C para conferência, J para jornal)
+    if weight <= 3:
+        return "C"  # Conferência
+    return "J"  # Jornal
+
+# Tabelas por peso, consultadas em vez das funções acima no laço dos artigos
+TIER_BY_WEIGHT = [get_venue_tier(w) for w in range(MAX_WEIGHT + 1)]
+TYPE_BY_WEIGHT = [get_venue_type(w) for w in range(MAX_WEIGHT + 1)]
+
+def get_paper_score(weight, scheme=DEFAULT_SCHEME):
+    # Artigos em locais fora do esquema não pontuam
+    return scheme.get(weight, 0.0)
+
+def get_lookup(scheme):
+    return [get_paper_score(w, scheme) for w in range(MAX_WEIGHT + 1)]
+
+def get_points(table, scheme=DEFAULT_SCHEME, first_year=None, last_year=None, tiers=None):
+    # Pontos de cada linha da tabela; linhas fora dos anos ou dos níveis pedidos valem 0
+    lookup = get_lookup(scheme)
+    if tiers is not None:
+        lookup = [p if TIER_BY_WEIGHT[w] in tiers else 0.0 for w, p in enumerate(lookup)]
+    points = array('d', [lookup[w] for w in table.weights])
+    if first_year is not None or last_year is not None:
+        first_year = first_year if first_year is not None else 0
+        last_year = last_year if last_year is not None else 65535
+        for row, year in enumerate(table.years):
+            if year < first_year or year > last_year:
+                points[row] = 0.0
+    return points
+
+def sum_by_dept(table, points):
+    # Soma os pontos por departamento; um artigo conta uma vez para cada departamento dele
+    totals = [0.0] * len(table.depts)
+    for dept_id, p in zip(table.first_depts, points):
+        totals[dept_id] += p
+    for row, dept_ids in table.more_depts.items():
+        for dept_id in dept_ids:
+            totals[dept_id] += points[row]
+    return dict(zip(table.depts.names, totals))
+
+def sum_by_dept_and(table, points, column):
+    # Soma os pontos por (departamento, valor da coluna), ex: column = table.years
+    totals = {}
+    for dept_id, value, p in zip(table.first_depts, column, points):
+        key = (dept_id, value)
+        totals[key] = totals.get(key, 0.0) + p
+    for row, dept_ids in table.more_depts.items():
+        for dept_id in dept_ids:
+            key = (dept_id, column[row])
+            totals[key] = totals.get(key, 0.0) + points[row]
+    names = table.depts.names
+    return {(names[dept_id], value): total for (dept_id, value), total in totals.items()}
+
+def sum_by_year(table, points):
+    return sum_by_dept_and(table, points, table.years)
+
+def sum_by_tier(table, points):
+    return sum_by_dept_and(table, points, [TIER_BY_WEIGHT[w] for w in table.weights])
+
+def sum_by_prof(points, prof_rows):
+    # prof_rows: professor -> linhas dos artigos dele na tabela
+    return {prof: sum(points[row] for row in rows) for prof, rows in prof_rows.items()}
+
+def rank(scores):
+    # Itens com pontuação positiva, da maior para a menor; empates em ordem alfabética. As somas
+    # são comparadas com RANK_DIGITS casas, para a ordem dos empates não depender da ordem das somas
+    return sorted(((k, s) for k, s in scores.items() if s > 0), key=lambda x: (-round(x[1], RANK_DIGITS), x[0]))
+
+# Leitura dos CSVs gerados pelo search.py, para avaliar esquemas sem rodar o search.py de novo
+
+def read_weights(area_prefix):
+    # Nome do local -> peso, de <area>-confs.csv
+    weights = {}
+    with open("../../data/" + area_prefix + "-confs.csv", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if len(row) == 3 and row[2].isdigit():
+                weights[row[1]] = int(row[2])
+    return weights
+
+def load_table(area_prefix):
+    # Monta a tabela da área a partir de <area>-out-papers.csv
+    weights = read_weights(area_prefix)
+    table = papers.PaperTable()
+    with open("../../data/" + area_prefix + "-out-papers.csv", encoding="utf-8", newline='') as f:
+        for row in csv.reader(f):
+            if len(row) < 10:
+                continue
+            year, venue, title, depts, authors, doi = row[:6]
+            url = year + "/" + venue + "/" + title  # Os CSVs não têm a URL da DBLP
+            if url in table or venue not in weights:
+                continue
+            depts = depts.split("; ")
+            i = table.add(url, int(year), venue, title, depts[0], authors.split("; "), doi,
+                          weights[venue], row[8], int(row[9]) if row[9] else 0)
+            for dept in depts[1:]:
+                table.add_dept(i, dept)
+    return table
+
+def load_profs(area_prefix):
+    # Professor -> departamento, de <area>-out-profs-list.csv (os professores da área na última execução)
+    profs = {}
+    file_name = "../../data/" + area_prefix + "-out-profs-list.csv"
+    if os.path.exists(file_name):
+        with open(file_name, encoding="utf-8", newline='') as f:
+            profs = {row[0]: row[1] for row in csv.reader(f) if len(row) >= 2}
+    return profs
+
+def load_prof_rows(area_prefix, table, profs=None):
+    # Professor -> linhas dos artigos dele, de papers/<area>-<prof>-papers.csv. Só os professores da
+    # área (profs, ou <area>-out-profs-list.csv): a pasta pode ter arquivos de quem saiu da área
+    if profs is None:
+        profs = load_profs(area_prefix)
+    prof_rows = {}
+    for prof in profs:
+        file_name = "../../data/configs/profs/papers/" + area_prefix + "-" + prof.replace(" ", "-") + "-papers.csv"
+        rows = []
+        if os.path.exists(file_name):
+            with open(file_name, encoding="utf-8", newline='') as f:
+                rows = [table.get_row(r[0] + "/" + r[1] + "/" + r[2]) for r in csv.reader(f) if len(r) >= 3]
+        prof_rows[prof] = [r for r in rows if r is not None]
+    return prof_rows
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rankings de uma área com outros pesos, anos ou níveis")
+    parser.add_argument("area", help="prefixo da área (ex: cs)")
+    parser.add_argument("--scheme", choices=sorted(SCHEMES), default="default", help="pontuação por peso")
+    parser.add_argument("--years", type=int, nargs=2, metavar=("INICIO", "FIM"), help="intervalo de anos")
+    parser.add_argument("--tiers", nargs="+", choices=TIERS, help="níveis dos locais considerados")
+    parser.add_argument("--by", choices=("dept", "year", "tier", "prof"), default="dept",
+                        help="agrupamento (departamento, departamento e ano, departamento e nível, professor)")
+    parser.add_argument("--top", type=int, help="mostra só os N primeiros")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    table = load_table(args.area)
+    prof_rows = load_prof_rows(args.area, table) if args.by == "prof" else None
+    start = time.perf_counter()
+    first_year, last_year = args.years if args.years else (None, None)
+    points = get_points(table, SCHEMES[args.scheme], first_year, last_year, args.tiers)
+    if args.by == "dept":
+        scores = sum_by_dept(table, points)
+    elif args.by == "year":
+        scores = sum_by_year(table, points)
+    elif args.by == "tier":
+        scores = sum_by_tier(table, points)
+    else:
+        scores = sum_by_prof(points, prof_rows)
+    ranking = rank(scores)
+    elapsed = time.perf_counter() - start
+    for key, score in ranking[:args.top]:
+        name = ",".join(str(k) for k in key) if isinstance(key, tuple) else key
+        print(name + "," + str(round(score, 2)))
+    print(f"{len(table)} papers, {len(ranking)} rows in {elapsed * 1000:.1f} ms")
@@ -1,55 +1,144 @@
 # Desativa certos tipos de alertas do Pylint para permitir uma maior flexibilidade no código.
 # pylint: disable=W0311,C0103,C0116,C0200,R1714
 
+import argparse     # Biblioteca para ler os argumentos de linha de comando.
 import csv          # Biblioteca para ler e escrever arquivos CSV.
 import re           # Biblioteca para trabalhar com expressões regulares.
 import sys          # Biblioteca para acessar variáveis do sistema e argumentos de linha de comando.
 import glob         # Biblioteca para buscar arquivos com padrões de nomes específicos.
 import os           # Biblioteca para interagir com o sistema operacional (como acessar arquivos).
-from difflib import SequenceMatcher  # Biblioteca para comparar sequências de strings.
-import requests     # Biblioteca para fazer requisições HTTP (ex: acessar a DBLP).
-import xmltodict    # Biblioteca para converter XML para dicionários Python.
+import multiprocessing  # Biblioteca para processar pesquisadores em paralelo.
+import io           # Biblioteca para montar arquivos em memória antes de gravá-los.
+import time         # Biblioteca para medir o tempo das etapas (--profile).
+import contextlib   # Biblioteca para montar os blocos medidos com --profile.
+import records      # Cache pré-processado dos registros da DBLP.
+import manifest     # Resultados da última execução, para reprocessar só o que mudou.
+import arxiv        # Links do arXiv, consultados em lote e guardados em um cache único.
+import dblp as dblp_crawler  # Download e cache dos arquivos XML da DBLP.
+import cache        # Cache em disco compartilhado (DBLP, arXiv, Semantic Scholar).
+import citations    # Número de citações, do cache do Semantic Scholar.
+import instrument   # Medidas opcionais de tempo e de filtros (--profile).
+import papers       # Tabela em colunas dos artigos de cada área.
+import scoring      # Pontuações e rankings calculados sobre a tabela de artigos.
+import store        # Índice por ano dos artigos de todos os anos, para consultar outras janelas.
+import bundles      # Pacotes JSON pré-agregados para as páginas de gráficos.
+import authors      # Índice de busca dos autores (caixa de busca de authors2.html).
 
 # Definindo o intervalo de anos para os artigos a serem processados
 FIRST_YEAR = 2020
 LAST_YEAR = 2025
 
+# Anos lidos dos XMLs e guardados no índice de artigos (store.py). As saídas só contam os artigos de
+# FIRST_YEAR a LAST_YEAR; outras janelas são consultadas no índice, sem reler os XMLs
+STORE_FIRST_YEAR = 1900
+STORE_LAST_YEAR = 2100
+
+# Pasta com os arquivos por professor (papers/ e search/) e o all-authors.csv; caminho absoluto,
+# resolvido uma vez a partir de src/DBLP
+PROFS_DIR = os.path.abspath("../../data/configs/profs") + "/"
+
 class Global:
-    default_min_paper_size = 0  # Tamanho mínimo de página padrão para artigos
-    black_list = {}             # Lista de artigos que não devem ser contados (por exemplo, artigos em trilhas inválidas)
-    white_list = {}             # Lista de artigos que devem ser contados (por exemplo, artigos sem número de páginas)
-    conflist = []               # Lista de conferências da área de pesquisa
-    journallist = []            # Lista de jornais da área de pesquisa
-    out = {}                    # Armazena os artigos já encontrados
-    score = {}                  # Armazena a pontuação dos departamentos
-    confdata = {}               # Armazena informações sobre conferências
-    profs = {}                  # Armazena dados sobre os professores
-    profs_list = []             # Lista de professores
-    arxiv_cache = {}            # Cache de links arXiv
-    manual_journals = {}        # Jornais classificados manualmente
-    manual_classification = {}  # Classificação manual de URLs
-    pid_papers = []             # Lista de artigos processados
-    area_prefix = sys.argv[1]  # Prefixo da área de pesquisa (como 'cs' para Ciência da Computação)
-    multi_area_journal_list = []  # Lista de jornais multi-área
-    mc_failed_file = open('../../data/configs/manual-classification-failed.csv', 'a')  # Arquivo para registrar falhas de classificação manual
+    manual_journals = frozenset()  # Jornais classificados manualmente
+    manual_classification = {}  # Classificação manual de URLs (chave: URL normalizada)
+    multi_area_journal_list = set()  # URLs normalizadas de jornais multi-área já registradas
+    config_files = {}           # Arquivos de configuração já lidos, relidos só quando mudam
+    mc_failed_file = None       # Arquivo das falhas de classificação manual, aberto na primeira falha
+    areas = []                  # Áreas de pesquisa processadas na mesma leitura dos XMLs
+    venues = set()              # Locais de publicação (nomes da DBLP) de todas as áreas
+    prof_papers = {}            # Índice por professor: nome -> {área: URLs dos artigos}
+    arxiv_cache = None          # Links do arXiv de todas as áreas (cache.LogCache, DOI -> link)
+    profile = None              # Medidas da execução (instrument.Profile), só com --profile
+    first_year = FIRST_YEAR     # Janela de anos das saídas (store.py usa outras janelas)
+    last_year = LAST_YEAR
+    output_dir = "../../data/"  # Pasta dos arquivos <area>-out-*.csv
+
+# Estado de uma área de pesquisa; cada área tem suas conferências, artigos e pontuações
+class Area:
+    def __init__(self, area_prefix):
+        self.area_prefix = area_prefix  # Prefixo da área de pesquisa (como 'cs' para Ciência da Computação)
+        self.default_min_paper_size = 0  # Tamanho mínimo de página padrão para artigos
+        self.black_list = frozenset()   # URLs de artigos que não devem ser contados (por exemplo, artigos em trilhas inválidas)
+        self.white_list = frozenset()   # URLs de artigos que devem ser contados (por exemplo, artigos sem número de páginas)
+        self.conflist = []              # Lista de conferências da área de pesquisa
+        self.journallist = []           # Lista de jornais da área de pesquisa
+        self.papers = papers.PaperTable()  # Armazena os artigos já encontrados (uma linha por URL)
+        self.confdata = {}              # Armazena informações sobre conferências
+        self.venue_tiers = {}           # Nível (top, near-top, null) de cada conferência/jornal
+        self.venue_counts = {}          # (tipo C/J, local) -> {ano: número de artigos}, atualizado a cada artigo novo
+        self.profs = {}                 # Armazena dados sobre os professores
+        self.profs_list = []            # Lista de professores
+        self.pid_papers = []            # Lista de artigos processados
+        self.found_paper = False        # Indica se o pesquisador atual tem artigos na área
+        self.hits = []                  # Artigos indexáveis do pesquisador atual, ainda não contabilizados
+        self.mc_failed_papers = []      # Falhas de classificação manual do pesquisador atual
+        self.config_hash = ""           # Hash da configuração da área, usado pelo manifesto
+        self.rejections = None          # Artigos rejeitados por motivo no pesquisador atual (só com --profile)
+
+# Funções para ler os arquivos de configuração (listas de URLs e de jornais)
+
+DBLP_URL_PREFIXES = ("https://dblp.org/", "http://dblp.org/", "https://dblp.uni-trier.de/", "http://dblp.uni-trier.de/")
+
+def normalize_url(url):
+    # Chave usada nas listas: sem espaços e sem o endereço do site da DBLP (ex: "db/conf/icra/icra2020.html#X")
+    url = url.strip()
+    for prefix in DBLP_URL_PREFIXES:
+        if url.startswith(prefix):
+            return url[len(prefix):]
+    return url
+
+def load_config_file(file, parse):
+    # Lê e converte um arquivo de configuração uma única vez; só relê se o arquivo mudou
+    stat = os.stat(file)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    key = (file, parse.__name__)
+    cached = Global.config_files.get(key)
+    if cached is None or cached[0] != stamp:
+        with open(file) as f:
+            cached = (stamp, parse(f))
+        Global.config_files[key] = cached
+    return cached[1]
+
+def parse_url_set(f):
+    return frozenset(normalize_url(line) for line in f.read().splitlines() if line.strip())
+
+def parse_line_set(f):
+    return frozenset(f.read().splitlines())
+
+def parse_manual_classification(f):
+    manual_classification = {}
+    for row in csv.reader(f):
+        m_area, _, _, _, m_url = row  # Extrai a área e a URL do jornal
+        manual_classification[normalize_url(m_url)] = m_area  # Associa a URL à área correspondente
+    return manual_classification
 
 # Funções para lidar com jornais classificados manualmente
 
 def init_manual_files():
     # Lê arquivos de classificação manual de jornais e armazena as informações
-    with open('../../data/configs/manual-journals.txt') as mf:
-        Global.manual_journals = mf.read().splitlines()  # Carrega os jornais manualmente classificados
-    reader = csv.reader(open('../../data/configs/manual-classification.csv', 'r'))
-    for row in reader:
-        m_area, _, _, _, m_url = row  # Extrai a área e a URL do jornal
-        Global.manual_classification[m_url] = m_area  # Associa a URL à área correspondente
+    Global.manual_journals = load_config_file('../../data/configs/manual-journals.txt', parse_line_set)
+    Global.manual_classification = load_config_file('../../data/configs/manual-classification.csv',
+                                                    parse_manual_classification)
+
+MC_FAILED_FILE = '../../data/configs/manual-classification-failed.csv'
+
+# O arquivo só é aberto quando há uma falha: importar este módulo (store.py, server.py) não abre
+# nenhum arquivo de saída
+def get_mc_failed_file():
+    if Global.mc_failed_file is None:
+        Global.mc_failed_file = open(MC_FAILED_FILE, 'a')
+    return Global.mc_failed_file
+
+def close_mc_failed_file():
+    if Global.mc_failed_file is not None:
+        Global.mc_failed_file.close()
+        Global.mc_failed_file = None
 
 # Registra falhas de classificação de jornais multi-área
 def output_mc_failed(year, dblp_venue, title, url):
-    if url in Global.multi_area_journal_list:
+    if normalize_url(url) in Global.multi_area_journal_list:
         return  # Se o URL já estiver na lista, não faz nada
-    Global.multi_area_journal_list.append(url)  # Adiciona o URL à lista
-    file = Global.mc_failed_file
+    Global.multi_area_journal_list.add(normalize_url(url))  # Adiciona o URL à lista
+    file = get_mc_failed_file()
     # Escreve a falha no arquivo
     file.write(",")
     file.write(str(year))
@@ -65,174 +154,230 @@ def output_mc_failed(year, dblp_venue, title, url):
 def output_multi_area_journal():
     if Global.multi_area_journal_list:
         print('\033[94m' + "Found papers in MULTI-AREA journals" + '\033[0m')
-    Global.mc_failed_file.close()
+    close_mc_failed_file()
 
 # arxiv-related functions
 
-def init_arxiv_cache():
-    # Inicializa o cache de URLs do arXiv a partir de um arquivo CSV
-    fname = '../../data/cache/arxiv/' + Global.area_prefix + '-arxiv-cache.csv'
-    if os.path.exists(fname):
-        reader = csv.reader(open(fname, 'r'))
-        for line in reader:
-            Global.arxiv_cache[line[0]] = line[1] # Armazena o DOI e seu link correspondente
-
 def output_arxiv_cache():
-    # Salva o cache do arXiv em um arquivo CSV
-    if Global.arxiv_cache:
-        f = open('../../data/cache/arxiv/' + Global.area_prefix + '-arxiv-cache.csv', 'w', encoding="utf-8", newline='')
-        for doi in Global.arxiv_cache:
-            f.write(doi)
-            f.write(',')
-            f.write(Global.arxiv_cache[doi])
-            f.write('\n')
-        f.close()
+    # Salva o cache do arXiv (único para todas as áreas)
+    arxiv.save_cache(Global.arxiv_cache)
 
-def get_arxiv_url(doi, title):
-    # Tenta obter o URL do arXiv com base no DOI e título do artigo
+def get_arxiv_url(doi):
+    # Link do arXiv do artigo, lido só do cache (as consultas são feitas antes, em resolve_arxiv_urls)
     if not isinstance(doi, str):
         return "no_arxiv"
-    if doi in Global.arxiv_cache:
-        return Global.arxiv_cache[doi]  # Retorna o URL do arXiv do cache
-    try:
-        title = title[:-1]
-        ti = '"' + title + '"'
-        url = "http://export.arxiv.org/api/query"
-        payload = {'search_query': ti, 'start': 0, 'max_results': 1}
-        arxiv_xml = requests.get(url, params=payload).text  # Faz uma requisição ao arXiv
-        arxiv = xmltodict.parse(arxiv_xml)
-        arxiv = arxiv["feed"]
-        arxiv_url = "no_arxiv"
-        nb_results = int(arxiv["opensearch:totalResults"]["#text"])
-        if nb_results == 1:
-            arxiv = arxiv["entry"]
-            arxiv_title = arxiv["title"]
-            t1 = arxiv_title.lower()
-            t2 = title.lower()
-            if SequenceMatcher(None, t1, t2).ratio() >= 0.9:
-                arxiv_url = arxiv["id"]
-    except:
-        arxiv_url = "no_arxiv"
-    Global.arxiv_cache[doi] = arxiv_url # Atualiza o cache
-    return arxiv_url
+    return arxiv.get_url(Global.arxiv_cache, doi)
+
+def resolve_arxiv_urls(results):
+    # Junta os DOIs de todos os artigos indexáveis (na janela de anos das saídas) ainda sem link no
+    # cache e consulta o arXiv em lote
+    dois = set()
+    papers = {}
+    for result in results:
+        for area_hits, _ in result:
+            for url, year, venue, title, doi, author_list, weight in area_hits:
+                if isinstance(doi, str) and doi not in dois and is_in_window(year):
+                    dois.add(doi)
+                    if not arxiv.is_resolved(Global.arxiv_cache, doi):
+                        papers[doi] = title[:-1]   # Sem o ponto final do título da DBLP
+    resolved = 0
+    start = time.perf_counter()
+    if papers:
+        print("arXiv: looking up " + str(len(papers)) + " papers")
+        resolved = arxiv.Resolver().resolve(Global.arxiv_cache, papers)
+        print("arXiv: " + str(resolved) + " of " + str(len(papers)) + " papers resolved")
+    if Global.profile is not None:
+        stats = Global.profile.arxiv
+        stats['dois'] += len(dois)
+        stats['cached'] += len(dois) - len(papers)
+        stats['lookups'] += len(papers)
+        stats['resolved'] += resolved
+        stats['network_seconds'] += time.perf_counter() - start
+
+# Citações (Semantic Scholar)
+
+def enrich_citations(fetch=False):
+    # Preenche as citações de todos os artigos de todas as áreas com uma única leitura do cache do
+    # Semantic Scholar; com fetch, antes busca na API os DOIs que não estão no cache
+    index = citations.load_index()
+    if fetch:
+        dois = set(doi for area in Global.areas for doi in area.papers.dois)
+        print("Semantic Scholar: " + str(citations.fetch_missing(index, dois)) + " papers fetched")
+    found = 0
+    for area in Global.areas:
+        table = area.papers
+        for row in range(len(table)):
+            count = index.get(table.dois[row], table.titles[row][1:-1], table.years[row])
+            if count is not None:
+                table.citations[row] = count
+                found += 1
+    print("Citations: " + str(found) + " of " + str(sum(len(a.papers) for a in Global.areas)) + " papers")
 
 # Funções de saída de dados
 
+def profile_stage(name, table=None):
+    # Mede o tempo de um bloco com --profile; sem ele, não faz nada
+    if Global.profile is None:
+        return contextlib.nullcontext()
+    return Global.profile.stage(name, table)
+
+def timed_output(name, output, *args):
+    # Chama uma função de saída, medindo seu tempo com --profile
+    with profile_stage(name, Global.profile.outputs if Global.profile is not None else None):
+        return output(*args)
+
 def outuput_everything():
-    # Chama várias funções para gerar arquivos de saída
-    output_papers()
-    output_scores()
-    output_venues()
-    output_profs_list()
-    output_arxiv_cache()
-    output_search_box_list()
-    output_multi_area_journal()
-
-def output_venues():
-    # Separa conferências e periódicos
-    confs = []
-    journals = []
-    for p in Global.out.items():
-        if p[1][7] == "C":
-            confs.append(p[1][1])
-        else:
-            journals.append(p[1][1])
-    result1_temp = sorted([(c, confs.count(c)) for c in Global.conflist], key=lambda x: x[0])
+    # Chama várias funções para gerar arquivos de saída de cada área
+    for area in Global.areas:
+        for output in (output_papers, output_scores, output_venues, output_profs_list, output_bundles):
+            timed_output(area.area_prefix + ":" + output.__name__, output, area)
+    timed_output("output_arxiv_cache", output_arxiv_cache)
+    other_area_profs = timed_output("read_other_area_profs", read_other_area_profs)
+    timed_output("output_search_files", output_search_files, other_area_profs)
+    timed_output("output_search_box_list", output_search_box_list, other_area_profs)
+    prof_areas = timed_output("output_prof_areas", output_prof_areas, other_area_profs)
+    timed_output("output_search_index", output_search_index, prof_areas)
+    timed_output("output_multi_area_journal", output_multi_area_journal)
+
+def get_venue_row(area, venue_type, venue):
+    # local, total de artigos, nível e número de artigos em cada ano do intervalo
+    years = area.venue_counts.get((venue_type, venue), {})
+    return ((venue, sum(years.values()), area.venue_tiers.get(venue, "null")) +
+            tuple(years.get(y, 0) for y in range(Global.first_year, Global.last_year + 1)))
+
+def get_venue_rows(area):
+    # As contagens já foram feitas em add_new_paper; aqui só ordena por quantidade e nome
+    result1_temp = sorted([get_venue_row(area, "C", c) for c in area.conflist], key=lambda x: x[0])
     result1 = sorted(result1_temp, key=lambda x: x[1], reverse=True)
-    result2_temp = sorted([(c, journals.count(c)) for c in Global.journallist], key=lambda x: x[0])
+    result2_temp = sorted([get_venue_row(area, "J", j) for j in area.journallist], key=lambda x: x[0])
     result2 = sorted(result2_temp, key=lambda x: x[1], reverse=True)
-    output_venues_confs(result1)
-    output_venues_journals(result2)
+    return result1, result2
+
+def output_venues(area):
+    result1, result2 = get_venue_rows(area)
+    output_venues_confs(area, result1)
+    output_venues_journals(area, result2)
+
+def write_venues(file_name, result):
+    f = open(file_name, 'w', encoding="utf-8", newline='')
+    for row in result:
+        # nome,quantidade,nivel,artigos_no_primeiro_ano,...,artigos_no_último_ano
+        f.write(row[0])
+        for value in row[1:]:
+            f.write(',')
+            f.write(str(value))
+        f.write('\n')
+    f.close()
 
 # lista de conferencias e a quatidade de artigos em cada uma
-def output_venues_confs(result):
+def output_venues_confs(area, result):
     if len(result) > 0:
-        f = open("../../data/" + Global.area_prefix + '-out-confs.csv', 'w', encoding="utf-8", newline='')
-        for conf in result:
-            # nome_da_conferencia,quantidade
-            f.write(conf[0])
-            f.write(',')
-            f.write(str(conf[1]))
-            f.write('\n')
-        f.close()
+        write_venues(Global.output_dir + area.area_prefix + '-out-confs.csv', result)
 
-# lista de conferencias e a quatidade de artigos em cada uma
-def output_venues_journals(result):
+# lista de jornais e a quatidade de artigos em cada um
+def output_venues_journals(area, result):
     if len(result) > 0:
-        f = open("../../data/" + Global.area_prefix + '-out-journals.csv', 'w', encoding="utf-8", newline='')
-        for journal in result:
-            f.write(journal[0])
-            f.write(',')
-            f.write(str(journal[1]))
-            f.write('\n')
-        f.close()
+        write_venues(Global.output_dir + area.area_prefix + '-out-journals.csv', result)
 
 # Função que escreve os detalhes de um artigo no arquivo   
     # coloca as infos em um csv
-def write_paper(f, is_prof_tab, paper):
+def write_paper(f, is_prof_tab, table, row):
     # f -> arquivo para escrita
     # is_prof_tab -> Se True, inclui o departamento do professor
-    # paper -> Lista (ou com os campos do artigo
-    f.write(str(paper[0]))      # Ano do artigo
+    # table, row -> Tabela de artigos da área (papers.PaperTable) e linha do artigo
+    weight = table.weights[row]
+    f.write(str(table.years[row]))      # Ano do artigo
     f.write(',')
-    f.write(str(paper[1]))      # Local de publicação (Conferência/Jornal)
+    f.write(table.get_venue(row))       # Local de publicação (Conferência/Jornal)
     f.write(',')
-    f.write(str(paper[2]))      # Título
+    f.write(table.titles[row])          # Título
     f.write(',')
     if is_prof_tab:
-        f.write(str(paper[3]))  # department
+        f.write(table.get_depts(row))   # department
         f.write(',')
-    authors = paper[4]
+    authors = table.authors[row]
     for author in authors[:-1]:      # Autor(es)
         f.write(str(author))
         f.write('; ')
     f.write(str(authors[-1]))       # Último autor
     f.write(',')
-    f.write(str(paper[5]))      # DOI
+    f.write(str(table.dois[row]))       # DOI
     f.write(',')
-    f.write(str(paper[6]))      # Tipo de conferência/jornal
+    f.write(scoring.TIER_BY_WEIGHT[weight])  # Tipo de conferência/jornal
     f.write(',')
-    f.write(str(paper[7]))      # Tipo de publicação (C/J)
+    f.write(scoring.TYPE_BY_WEIGHT[weight])  # Tipo de publicação (C/J)
     f.write(',')
-    f.write(str(paper[8]))  # Link arxiv
+    f.write(str(table.arxiv_urls[row]))  # Link arxiv
     f.write(',')
-    if paper[9] != -1:
-        f.write(str(paper[9]))  # Citações
+    if table.citations[row] != -1:
+        f.write(str(table.citations[row]))  # Citações
     f.write('\n')
 
 
 # Função que gera os arquivos de saída para os artigos
-def output_papers():
-    # Ordena os artigos primeiro pela conferência/jornal e, em seguida, pelo título (colunas 1 e 2)
-    out2 = sorted(Global.out.items(), key=lambda x: (x[1][1], x[1][2]))
+def get_sorted_rows(table):
+    # Ordena os artigos primeiro pela conferência/jornal e, em seguida, pelo título
+    rows = sorted(range(len(table)), key=lambda row: (table.get_venue(row), table.titles[row]))
 
-    # Ordena os artigos pela data de publicação (coluna 0) em ordem decrescente
-    sorted_papers = sorted(out2, key=lambda x: x[1][0], reverse=True)
+    # Ordena os artigos pela data de publicação em ordem decrescente
+    rows.sort(key=lambda row: table.years[row], reverse=True)
+    return rows
 
+def output_papers(area):
+    table = area.papers
     # Abre um arquivo CSV para salvar os artigos processados
-    f = open("../../data/" + Global.area_prefix + '-out-papers.csv', 'w', encoding="utf-8", newline='')
-    for i in range(0, len(sorted_papers)):
-        paper = sorted_papers[i][1]
-        write_paper(f, True, paper)
+    f = open(Global.output_dir + area.area_prefix + '-out-papers.csv', 'w', encoding="utf-8", newline='')
+    for row in get_sorted_rows(table):
+        write_paper(f, True, table, row)
     f.close()
 
-#  gera csv contendo todos os artigos de um professor em determinada área
-def output_prof_papers(prof):
-    # Substitui espaços no nome do professor por hífens para formar o nome do arquivo
-    prof = prof.replace(" ", "-")
+def get_bundle_paper(table, row):
+    # Mesmas colunas do <area>-out-papers.csv, com o título sem aspas
+    weight = table.weights[row]
+    citations = table.citations[row]
+    return [table.years[row], table.get_venue(row), table.titles[row][1:-1], table.get_depts(row),
+            "; ".join(str(a) for a in table.authors[row]), str(table.dois[row]),
+            scoring.TIER_BY_WEIGHT[weight], scoring.TYPE_BY_WEIGHT[weight],
+            str(table.arxiv_urls[row]), citations if citations != -1 else None]
+
+def output_bundles(area):
+    # Pacotes das páginas de gráficos: as mesmas informações dos CSVs da área, já agregadas
+    table = area.papers
+    rows = get_sorted_rows(table)
+    confs, journals = get_venue_rows(area)
+    points = scoring.get_points(table)
+    depts = scoring.rank(scoring.sum_by_dept(table, points))[:bundles.CHART_DEPTS]
+    summary = {'area': area.area_prefix,
+               'years': list(range(Global.first_year, Global.last_year + 1)),
+               'confs': [list(r) for r in confs], 'journals': [list(r) for r in journals],
+               'depts': [[dept, round(s, 2)] for dept, s in depts],
+               'profs': [list(p) for p in sorted(area.profs_list, key=lambda x: x[0])]}
+    papers = [get_bundle_paper(table, row) for row in rows]
+    bundles.write_area(area.area_prefix, bundles.get_area_bundles(summary, papers))
+
+# Grava o arquivo só se o conteúdo mudou, para não reescrever os arquivos dos professores a cada execução
+def write_file_if_changed(file_name, text, encoding="utf-8"):
+    if os.path.exists(file_name):
+        with open(file_name, encoding=encoding, newline='') as f:
+            if f.read() == text:
+                return
+    with open(file_name, 'w', encoding=encoding, newline='') as f:
+        f.write(text)
 
-    # Abre um arquivo CSV específico para armazenar os artigos do professor
-    f = open("../../data/configs/profs/papers/" + Global.area_prefix + "-" + prof + '-papers.csv', 'w', encoding="utf-8", newline='')
+#  gera csv contendo todos os artigos de um professor em determinada área
+def output_prof_papers(area, prof, urls):
+    # Monta em memória todos os artigos do professor na área
+    f = io.StringIO()
+    for url in urls:
+        write_paper(f, False, area.papers, area.papers.rows[url])
 
-    # Escreve todos os artigos do professor usando o identificador 'pid_papers' armazenado em Global
-    for url in Global.pid_papers:
-        paper = Global.out[url]
-        write_paper(f, False, paper)
-    f.close()
+    # Grava o arquivo CSV específico do professor (espaços do nome viram hífens)
+    write_file_if_changed(PROFS_DIR + "papers/" + area.area_prefix + "-" + prof.replace(" ", "-") + '-papers.csv', f.getvalue())
+    return f.getvalue()
 
 #  CSV das pontuações de desempenho dos departamentos
-def write_scores(sorted_scores):
-    f = open("../../data/" + Global.area_prefix + '-out-scores.csv', 'w', encoding="utf-8", newline='')
+def write_scores(area, sorted_scores):
+    f = open(Global.output_dir + area.area_prefix + '-out-scores.csv', 'w', encoding="utf-8", newline='')
 
     # Escreve as pontuações dos departamentos no arquivo
     for i in range(0, len(sorted_scores)):
@@ -245,24 +390,15 @@ def write_scores(sorted_scores):
         f.write('\n')
     f.close()
 
-def output_scores():
-    final_score = {}
-
-    # Filtra os departamentos que têm pontuação maior que 0
-    for dept in Global.score:
-        s = Global.score[dept]
-        if s > 0:
-            final_score[dept] = s
-
-    # Ordena os departamentos pela pontuação de forma crescente pelo nome
-    sorted_scores_temp = sorted(final_score.items(), key=lambda x: x[0])
-    # Ordena novamente pela pontuação de forma decrescente
-    sorted_scores = sorted(sorted_scores_temp, key=lambda x: x[1], reverse=True)
-    write_scores(sorted_scores)
+def output_scores(area):
+    # Soma a pontuação dos artigos de cada departamento sobre a tabela da área e ordena pela
+    # pontuação (decrescente) e pelo nome; departamentos sem pontos ficam de fora
+    points = scoring.get_points(area.papers)
+    write_scores(area, scoring.rank(scoring.sum_by_dept(area.papers, points)))
 
-def write_profs(sorted_profs):
+def write_profs(area, sorted_profs):
     # Abre um arquivo CSV para salvar a lista de professores e suas pontuações
-    f = open("../../data/" + Global.area_prefix + '-out-profs.csv', 'w', encoding="utf-8", newline='')
+    f = open(Global.output_dir + area.area_prefix + '-out-profs.csv', 'w', encoding="utf-8", newline='')
 
     # Escreve o nome do departamento e a pontuação dos professores no arquivo
     for i in range(0, len(sorted_profs)):
@@ -274,33 +410,22 @@ def write_profs(sorted_profs):
         f.write('\n')
     f.close()
 
-def output_profs():
-    final_profs = {}
-
-    # Filtra os professores com pontuação maior que 0
-    for dept in Global.profs:
-        s = Global.profs[dept]
-        if s > 0:
-            final_profs[dept] = s
-
-    # Ordena os departamentos por pontuação de forma crescente pelo nome
-    sorted_profs_temp = sorted(final_profs.items(), key=lambda x: x[0])
-
-    # Ordena novamente pela pontuação de forma decrescente
-    sorted_profs = sorted(sorted_profs_temp, key=lambda x: x[1], reverse=True)
+def output_profs(area):
+    # Departamentos com professores, do maior para o menor número; empates em ordem alfabética
+    sorted_profs = scoring.rank(area.profs)
 
     # Limita a lista a apenas os 16 primeiros professores
     if len(sorted_profs) >= 16:
         sorted_profs = sorted_profs[:16]
-    write_profs(sorted_profs)
+    write_profs(area, sorted_profs)
 
-def output_profs_list():
+def output_profs_list(area):
     # Ordena a lista de professores pela ordem alfabética
-    profs = Global.profs_list
+    profs = area.profs_list
     profs = sorted(profs, key=lambda x: x[0])
 
     # Abre um arquivo CSV para salvar a lista de professores
-    f = open("../../data/" + Global.area_prefix + '-out-profs-list.csv', 'w', encoding="utf-8", newline='')
+    f = open(Global.output_dir + area.area_prefix + '-out-profs-list.csv', 'w', encoding="utf-8", newline='')
     for i in range(0, len(profs)):
         f.write(str(profs[i][0]))   # Nome do professor
         f.write(',')
@@ -308,75 +433,104 @@ def output_profs_list():
         f.write('\n')
     f.close()
 
-# merge todos os arquivos CSV de artigos de um professor em um unico csv
-def merge_output_prof_papers(prof):
-    # Muda o diretório para o local onde estão armazenados os artigos dos professores
-    os.chdir("../../data/configs/profs/search/")
-
-    # Cria uma lista
-    filenames = []
-
-    # Substitui espaços por hífens no nome do professor para criar o nome do arquivo
-    prof = prof.replace(" ", "-")
-
-    # Busca todos os arquivos que possuem o nome do professor e terminam com "-papers.csv"
-    for file in glob.glob("*" + prof + "-papers.csv"):
-        filenames.append(file)
-
-    # Ordena os arquivos pelo nome
-    filenames.sort()
-
-    # Abre um arquivo de saída para armazenar os artigos unidos
-    outfile = open( prof + ".csv", 'w')
-
-    for fname in filenames:
-        with open(fname) as infile:
-            outfile.write(infile.read())
-    os.chdir("../../")
-
-#  gera all-authors.csv com o nome de todos os professores presentes na pasta confg/profs/search
+# Professores com artigos nas áreas configuradas que não foram processadas nesta execução,
+# lidos do <area>-out-profs-list.csv da última execução de cada área
+def read_other_area_profs():
+    processed = set(area.area_prefix for area in Global.areas)
+    other_area_profs = {}
+    for area_prefix in get_configured_areas():
+        file_name = "../../data/" + area_prefix + "-out-profs-list.csv"
+        if area_prefix in processed or not os.path.exists(file_name):
+            continue
+        with open(file_name, encoding="utf-8", newline='') as f:
+            other_area_profs[area_prefix] = set(row[0] for row in csv.reader(f) if row)
+    return other_area_profs
+
+# grava os artigos de cada professor em cada área e junta todos em um único csv
+def output_search_files(other_area_profs):
+    areas = {area.area_prefix: area for area in Global.areas}
+    for prof, area_urls in Global.prof_papers.items():
+        prof_file = prof.replace(" ", "-")
+        papers = {}
+        for area_prefix, urls in area_urls.items():
+            papers[area_prefix] = output_prof_papers(areas[area_prefix], prof, urls)
+        # Áreas não processadas agora: usa o arquivo gravado na última execução da área
+        for area_prefix, profs in other_area_profs.items():
+            file_name = PROFS_DIR + "papers/" + area_prefix + "-" + prof_file + "-papers.csv"
+            if prof in profs and os.path.exists(file_name):
+                with open(file_name, encoding="utf-8", newline='') as f:
+                    papers[area_prefix] = f.read()
+
+        # As áreas ficam na ordem dos nomes dos arquivos (<area>-<prof>-papers.csv)
+        merged = "".join(papers[a] for a in sorted(papers, key=lambda a: a + "-"))
+        write_file_if_changed(PROFS_DIR + "search/" + prof_file + ".csv", merged)
+
+#  gera all-authors.csv com o nome de todos os professores com artigos em alguma área
     # usado pora a busca por professores em profs.html
-def output_search_box_list():
-    # Muda o diretório para a pasta onde os arquivos de pesquisa dos professores estão localizados
-    os.chdir("../../data/configs/profs/search/")
-
-    # Cria uma lista para armazenar os nomes dos professores
-    profs = []
-
-    # Busca todos os arquivos CSV na pasta e os adiciona à lista
-    for file in glob.glob("*.csv"):
-        file = file.replace(".csv", "") # Remove a extensão ".csv"
-        file = file.replace("-", " ")   # Substitui hífens por espaços
-        profs.append(file)
-
-    # Remove o item "empty" da lista, se existir
-    profs.remove("empty")
-
-    # Ordena os professores em ordem alfabética
-    profs.sort()
-
-    # Gera o arquivo all-authors.csv
-    f = open("../all-authors.csv", 'w', encoding="utf-8", newline='')
-    for p in profs:
+def output_search_box_list(other_area_profs):
+    profs = set(Global.prof_papers)
+    for area_profs in other_area_profs.values():
+        profs.update(area_profs)
+
+    # Gera o arquivo all-authors.csv, em ordem alfabética
+    f = io.StringIO()
+    for p in sorted(profs):
         f.write(p)
         f.write('\n')
-    f.close()
+    write_file_if_changed(PROFS_DIR + "all-authors.csv", f.getvalue())
+
+# Número de artigos de cada professor em cada área (o número de linhas de papers/<area>-<prof>-papers.csv)
+def read_prof_areas():
+    prof_areas = {}
+    file_name = PROFS_DIR + "all-areas.csv"
+    if os.path.exists(file_name):
+        with open(file_name, encoding="utf-8", newline='') as f:
+            for row in csv.reader(f):
+                if len(row) == 3:
+                    prof_areas.setdefault(row[0], {})[row[1]] = int(row[2])
+    return prof_areas
+
+def count_lines(file_name):
+    with open(file_name, encoding="utf-8", newline='') as f:
+        return sum(1 for line in f)
+
+#  gera all-areas.csv (professor,área,artigos), usado pelo runprofs.py para achar a área principal
+    # de cada professor sem abrir os arquivos de artigos; é um arquivo gerado, fora do repositório
+def output_prof_areas(other_area_profs):
+    prof_areas = {}
+    for prof, area_urls in Global.prof_papers.items():
+        for area_prefix, urls in area_urls.items():
+            prof_areas.setdefault(prof, {})[area_prefix] = len(urls)
+    # Áreas não processadas agora: usa a contagem da última execução, ou conta as linhas do arquivo
+    old_prof_areas = read_prof_areas() if other_area_profs else {}
+    for area_prefix, profs in other_area_profs.items():
+        for prof in profs:
+            count = old_prof_areas.get(prof, {}).get(area_prefix)
+            if count is None:
+                file_name = PROFS_DIR + "papers/" + area_prefix + "-" + prof.replace(" ", "-") + "-papers.csv"
+                count = count_lines(file_name) if os.path.exists(file_name) else 0
+            prof_areas.setdefault(prof, {})[area_prefix] = count
+
+    f = io.StringIO()
+    for prof in sorted(prof_areas):
+        for area_prefix, count in sorted(prof_areas[prof].items()):
+            f.write(prof + ',' + area_prefix + ',' + str(count) + '\n')
+    write_file_if_changed(PROFS_DIR + "all-areas.csv", f.getvalue())
+    return prof_areas
+
+#  gera search-index.json, o índice de busca por nome, departamento e área dos professores de
+    # all-authors.csv (ver authors.py)
+def output_search_index(prof_areas):
+    depts = {r[0]: r[1] for r in csv.reader(open("../../data/configs/all-researchers.csv", 'r')) if len(r) >= 2}
+    index_authors = {}
+    for prof, areas in prof_areas.items():
+        # Áreas da maior para a menor produção
+        index_authors[prof] = (depts.get(prof, ""), sorted(areas, key=lambda a: (-areas[a], a)))
+    write_file_if_changed(PROFS_DIR + "search-index.json", bundles.encode(authors.build_index(index_authors)).decode("utf-8"))
 
 
 # dblp parsing auxiliary functions
 
-def get_paper_score(weight):
-    # Atribui uma pontuação com base no peso (classificação) do artigo
-    if (weight == 1) or (weight == 4):
-        return 1.0  # Artigos em conferências ou revistas top
-    if weight == 2:
-        return 0.66  # Artigos em conferências de nível intermediário
-    if (weight == 3) or (weight == 6) or (weight == 7):
-        return 0.33  # Artigos em conferências de baixo nível
-    if weight == 5:
-        return 0.4   # Artigos em revistas de baixo nível
-    return 0.0       # Artigos sem pontuação definida
-
 def get_doi(doi):
     # Verifica o tipo do DOI e retorna o valor correto
     if isinstance(doi, list):
@@ -385,20 +539,6 @@ def get_doi(doi):
         doi = doi["#text"]
     return doi
 
-def get_venue_tier(weight):
-    # Retorna o "nível" do evento baseado no peso (classificação)
-    if (weight == 1) or (weight == 4):
-        return "top"  # Top venues
-    if weight == 2:
-        return "near-top"  # Near-top venues
-    return "null"  # Outros
-
-def get_venue_type(weight):
-    # Retorna o tipo do evento (C para conferência, J para jornal)
-    if weight <= 3:
-        return "C"  # Conferência
-    return "J"  # Jornal
-
 def get_authors(author_list):
     authors = []
     if isinstance(author_list, dict):  # Artigo com um único autor
@@ -420,12 +560,12 @@ def get_title(title):
     return title.replace("\"", "")  # Remove aspas do título
 
 ## mantido do original
-def get_min_paper_size(weight):
+def get_min_paper_size(area, weight):
     if weight == 6:  # magazine
         return 6  # Artigos em revistas (com peso 6) têm tamanho mínimo de 6 páginas
     if (weight == 4) or (weight == 5) or (weight == 7):  # journals
         return 0   # Para artigos em jornais com peso 4, 5 ou 7, o tamanho mínimo é 0 (devido à falta de número de páginas nos jornais da Elsevier)
-    return Global.default_min_paper_size  # Para conferências, usa o tamanho mínimo padrão definido na classe Global
+    return area.default_min_paper_size  # Para conferências, usa o tamanho mínimo padrão definido para a área
 
 def as_int(i):
     try:
@@ -453,8 +593,8 @@ def parse_paper_size(dblp_pages):
     
     return 0  # Caso não tenha um formato esperado, retorna 0
 
-def get_paper_size(url, dblp, dblp_venue):
-    if url in Global.white_list:  # Se o URL estiver na lista branca, o artigo tem um tamanho de 10 páginas
+def get_paper_size(area, url, dblp, dblp_venue):
+    if normalize_url(url) in area.white_list:  # Se o URL estiver na lista branca, o artigo tem um tamanho de 10 páginas
         return 10
     
     if 'pages' in dblp:  # Se o campo 'pages' estiver no artigo, chama a função para calcular o tamanho da página
@@ -489,252 +629,449 @@ def get_dblp_venue(dblp):
         sys.exit(1)  # Encerra o programa devido a erro na análise
     return dblp_venue  # Retorna o nome do jornal ou livro
 
-def has_dept(dept_str, dept):
-    dept_list = dept_str.split(";")  # Divide a string de departamentos em uma lista
-    for d in dept_list:
-        d = d.replace(" ", "")  # Remove espaços em branco
-        if d == dept:  # Verifica se o departamento atual corresponde ao departamento procurado
-            return True
-    return False  # Retorna False se o departamento não for encontrado
-
 # lista manual?
-def is_manual_journal(year, dblp_venue, title, url):
+def is_manual_journal(area, year, dblp_venue, title, url):
     # Verifica se o jornal está na lista manual de jornais classificados
     if dblp_venue in Global.manual_journals:
         # Se o URL do jornal estiver na classificação manual, verifica a área
-        if url in Global.manual_classification:
-            m_area = Global.manual_classification[url]  # Obtém a área do jornal
-            if m_area != Global.area_prefix:  # Se a área não coincidir com a área de pesquisa
+        key = normalize_url(url)
+        if key in Global.manual_classification:
+            m_area = Global.manual_classification[key]  # Obtém a área do jornal
+            if m_area != area.area_prefix:  # Se a área não coincidir com a área de pesquisa
                 return True  # Retorna True para indicar que é um jornal manual
         else:
-            # Se o URL não estiver na classificação manual, registra a falha
-            output_mc_failed(year, dblp_venue, title, url)
+            # Se o URL não estiver na classificação manual, guarda a falha para registrá-la depois
+            area.mc_failed_papers.append((year, dblp_venue, title, url))
             return True  # Retorna True indicando que é um jornal manual
     return False  # Se não for manual, retorna False
 
 # main dblp parse function
 
-def is_paper_size_ok(url, dblp, dblp_venue, weight):
+def is_paper_size_ok(area, url, dblp, dblp_venue, weight):
     # Obtém o tamanho do artigo (número de páginas) com base nos dados fornecidos
-    size = get_paper_size(url, dblp, dblp_venue)
+    size = get_paper_size(area, url, dblp, dblp_venue)
     # Obtém o tamanho mínimo do artigo baseado no peso do artigo (classificação)
-    minimum_size = get_min_paper_size(weight)
+    minimum_size = get_min_paper_size(area, weight)
     # Verifica se o tamanho do artigo é maior ou igual ao tamanho mínimo
     return size >= minimum_size
 
-def update_paper(paper, dept, url, weight):
-    # Atualiza os dados do artigo no dicionário `Global.out`
-    Global.out[url] = (paper[0], paper[1], paper[2], paper[3] + "; " + dept,
-                        paper[4], paper[5], paper[6], paper[7], paper[8],
-                        paper[9])
-    # Atualiza a pontuação do departamento associado ao artigo
-    Global.score[dept] += get_paper_score(weight)
-
-def add_new_paper(weight, doi, title, dblp, url, year, venue, global_department):
-    # Determina o nível da conferência/jornal com base no peso
-    tier = get_venue_tier(weight)
-    # Determina o tipo de evento (conferência ou jornal)
-    venue_type = get_venue_type(weight)
+def update_paper(area, row, dept):
+    # Acrescenta o departamento ao artigo na tabela `area.papers`; a pontuação é somada depois,
+    # sobre a tabela toda, em output_scores
+    area.papers.add_dept(row, dept)
+
+def add_new_paper(area, weight, doi, title, author_list, url, year, venue, global_department):
+    # Determina o tipo de evento (conferência ou jornal); o nível é calculado do peso na saída
+    venue_type = scoring.get_venue_type(weight)
     # Obtém o link para o arXiv associado ao artigo
-    arxiv = get_arxiv_url(doi, title)
-    # Inicializa o número de citações como 0
-    citations = 0
+    arxiv_url = get_arxiv_url(doi)
     # Obtém a lista de autores do artigo
-    authors = get_authors(dblp['author'])
-    # Adiciona o artigo aos dados globais
-    Global.out[url] = (year, venue, '"' + title + '"', global_department, authors, doi,
-                        tier, venue_type, arxiv, citations)
-    # Atualiza a pontuação do departamento com base no peso do artigo
-    Global.score[global_department] += get_paper_score(weight)
-
-# Verifica se o artigo é indexável (se possui 'journal' ou 'booktitle' e está no intervalo de anos permitido)
-def is_paper_indexable(dblp):
+    authors = get_authors(author_list)
+    # Adiciona o artigo à tabela da área; as citações são preenchidas depois, em enrich_citations
+    area.papers.add(url, year, venue, title, global_department, authors, doi, weight, arxiv_url)
+    # Atualiza a contagem de artigos do local no ano (coautorias em update_paper não mudam a contagem)
+    years = area.venue_counts.setdefault((venue_type, venue), {})
+    years[year] = years.get(year, 0) + 1
+
+# Filtro rápido aplicado aos registros antes de parse_dblp: só passam registros no intervalo de anos
+# e publicados em algum local de alguma das áreas
+def get_record_rejection(dblp):
+    # Motivo pelo qual o registro não passa no filtro rápido (um dos instrument.REJECTIONS), ou None
+    if ('journal' not in dblp) and ('booktitle' not in dblp):
+        return 'no_venue'
+    year = as_int(dblp.get('year'))
+    if (year < STORE_FIRST_YEAR) or (year > STORE_LAST_YEAR):
+        return 'year'
+    if get_dblp_venue(dblp) not in Global.venues:
+        return 'venue'
+    return None
+
+def is_record_in_areas(dblp):
+    return get_record_rejection(dblp) is None
+
+# Motivo pelo qual o artigo não é indexável na área (um dos instrument.REJECTIONS), ou None se ele é
+# indexável: precisa ter 'journal' ou 'booktitle', estar no intervalo de anos do índice e em um
+# local da área (a janela das saídas é aplicada depois, em add_researcher_results)
+def get_rejection(area, dblp):
     if not isinstance(dblp, dict):
-        return False
-    if ('journal' in dblp) or ('booktitle' in dblp):
-        dblp_venue = get_dblp_venue(dblp)  # Obtém o local da conferência/jornal
-        year = int(dblp['year'])  # Obtém o ano do artigo
-        # Verifica se o artigo está no intervalo de anos e se a conferência/jornal é válida
-        if (year >= FIRST_YEAR) and (year <= LAST_YEAR) and (dblp_venue in Global.confdata):
-            _, weight = Global.confdata[dblp_venue]
-            url = dblp['url']
-            if url in Global.black_list:
-                return False  # Se o artigo estiver na lista negra, não é indexável
-            title = get_title(dblp['title'])
-            # Verifica se o jornal é manualmente classificado e se não deve ser indexado
-            if is_manual_journal(year, dblp_venue, title, url):
-                return False
-            # Verifica se o artigo tem um tamanho adequado
-            return is_paper_size_ok(url, dblp, dblp_venue, weight)
-    return False  # Se o artigo não for válido para indexação, retorna False
-
-def parse_dblp(_, dblp):
-    global global_department, global_found_paper
-
-    # Verifica se o artigo pode ser indexado
-    if is_paper_indexable(dblp):
+        return 'no_venue'
+    if ('journal' not in dblp) and ('booktitle' not in dblp):
+        return 'no_venue'
+    dblp_venue = get_dblp_venue(dblp)  # Obtém o local da conferência/jornal
+    year = int(dblp['year'])  # Obtém o ano do artigo
+    # Verifica se o artigo está no intervalo de anos e se a conferência/jornal é válida
+    if (year < STORE_FIRST_YEAR) or (year > STORE_LAST_YEAR):
+        return 'year'
+    if dblp_venue not in area.confdata:
+        return 'venue'
+    _, weight = area.confdata[dblp_venue]
+    url = dblp['url']
+    if normalize_url(url) in area.black_list:
+        return 'black_list'  # Se o artigo estiver na lista negra, não é indexável
+    title = get_title(dblp['title'])
+    # Verifica se o jornal é manualmente classificado e se não deve ser indexado
+    if is_manual_journal(area, year, dblp_venue, title, url):
+        return 'manual_journal'
+    # Verifica se o artigo tem um tamanho adequado
+    if not is_paper_size_ok(area, url, dblp, dblp_venue, weight):
+        return 'page_size'
+    return None
+
+def is_paper_indexable(area, dblp):
+    return get_rejection(area, dblp) is None
+
+def parse_dblp_area(area, dblp):
+    # Verifica se o artigo pode ser indexado na área
+    rejection = get_rejection(area, dblp)
+    if rejection is not None:
+        if area.rejections is not None:   # Só com --profile
+            area.rejections[rejection] = area.rejections.get(rejection, 0) + 1
+    else:
         dblp_venue = get_dblp_venue(dblp)  # Obtém o local da conferência/jornal
         year = int(dblp['year'])  # Obtém o ano do artigo
-        venue, weight = Global.confdata[dblp_venue]  # Obtém o nome da conferência/jornal e seu peso
+        venue, weight = area.confdata[dblp_venue]  # Obtém o nome da conferência/jornal e seu peso
         url = dblp['url']  # URL do artigo
         doi = get_doi(dblp['ee'])  # DOI do artigo
         title = get_title(dblp['title'])  # Título do artigo
+        # Guarda o artigo; ele só é contabilizado em add_researcher_papers
+        area.hits.append((url, year, venue, title, doi, dblp.get('author'), weight))
 
-        global_found_paper = True   # Marca que o artigo foi encontrado
-        Global.pid_papers.append(url)  # Adiciona o artigo à lista de artigos encontrados
+def parse_dblp(_, dblp):
+    # Um único parse do XML classifica o registro em todas as áreas
+    for area in Global.areas:
+        parse_dblp_area(area, dblp)
+    return True   # Continua processando os próximos artigos
+
+def add_researcher_papers(area, dept, hits):
+    # Contabiliza os artigos encontrados para um pesquisador, na ordem em que aparecem no XML
+    area.pid_papers = []
+    area.found_paper = len(hits) > 0
+    for url, year, venue, title, doi, author_list, weight in hits:
+        area.pid_papers.append(url)  # Adiciona o artigo à lista de artigos encontrados
 
-        if url in Global.out:  # Se o artigo já foi processado
-            paper = Global.out[url]
+        row = area.papers.get_row(url)
+        if row is not None:  # Se o artigo já foi processado
             # Verifica se o artigo já foi atribuído ao departamento
-            if has_dept(paper[3], global_department):
-                return True  # Se já foi, não faz nada
-            update_paper(paper, global_department, url, weight)  # Atualiza os dados do artigo
-            return True
-        
+            if area.papers.has_dept(row, dept):
+                continue  # Se já foi, não faz nada
+            update_paper(area, row, dept)  # Atualiza os dados do artigo
+            continue
+
         # Adiciona um novo artigo ao banco de dados
-        add_new_paper(weight, doi, title, dblp, url, year, venue, global_department)
-    
-    return True   # Continua processando os próximos artigos
+        add_new_paper(area, weight, doi, title, author_list, url, year, venue, dept)
 
 # init functions
 
-def init_black_list():
+def init_black_list(area):
     # Lê a lista negra de artigos que não devem ser contados
-    black_list_file = "../../data/" + Global.area_prefix + "-black-list.txt"
+    black_list_file = "../../data/" + area.area_prefix + "-black-list.txt"
     if os.path.exists(black_list_file):
-        with open(black_list_file) as blf:
-            Global.black_list = blf.read().splitlines()  # Armazena os URLs dos artigos na lista negra
+        area.black_list = load_config_file(black_list_file, parse_url_set)  # Armazena os URLs dos artigos na lista negra
 
-def init_white_list():
+def init_white_list(area):
     # Lê a lista branca de artigos que devem ser contados
-    white_list_file = "../../data/" + Global.area_prefix + "-white-list.txt"
+    white_list_file = "../../data/" + area.area_prefix + "-white-list.txt"
     if os.path.exists(white_list_file):
-        with open(white_list_file) as wlf:
-            Global.white_list = wlf.read().splitlines()  # Armazena os URLs dos artigos na lista branca
+        area.white_list = load_config_file(white_list_file, parse_url_set)  # Armazena os URLs dos artigos na lista branca
 
-def init_prof_cache():
+def init_prof_cache(area):
     # Remove os arquivos de cache antigos dos professores
-    prof_cache_pattern = "../cache/profs/" + Global.area_prefix + "-*.csv"
+    prof_cache_pattern = "../cache/profs/" + area.area_prefix + "-*.csv"
     for f in glob.glob(prof_cache_pattern):
         os.remove(f)
 
-def init_confs():
+def init_confs(area):
     # Lê os dados das conferências e jornais a partir de um arquivo CSV
-    reader = csv.reader(open("../../data/"+ Global.area_prefix + "-confs.csv", 'r'))
+    reader = csv.reader(open("../../data/"+ area.area_prefix + "-confs.csv", 'r'))
     for conf_row in reader:
         conf_dblp, conf_name, conf_weight = conf_row
-        Global.confdata[conf_dblp] = conf_name, int(conf_weight)  # Armazena o nome e peso da conferência
+        area.confdata[conf_dblp] = conf_name, int(conf_weight)  # Armazena o nome e peso da conferência
+        area.venue_tiers[conf_name] = scoring.get_venue_tier(int(conf_weight))
         if int(conf_weight) <= 3:
-            Global.conflist.append(conf_name)  # Se o peso for baixo, é uma conferência
+            area.conflist.append(conf_name)  # Se o peso for baixo, é uma conferência
         else:
-            Global.journallist.append(conf_name)  #_
+            area.journallist.append(conf_name)  #_
 
-def init_min_paper_size():
+def init_min_paper_size(area):
     # Abre o arquivo "research-areas-config.csv" para ler as configurações da área de pesquisa
     reader = csv.reader(open("../../data/configs/research-areas-config.csv", 'r'))
     
     # Itera sobre cada linha do arquivo CSV
     for area_tuple in reader:
         # Verifica se o prefixo da área de pesquisa no arquivo é igual ao prefixo global da área
-        if area_tuple[0] == Global.area_prefix:
+        if area_tuple[0] == area.area_prefix:
             # Se for, define o tamanho mínimo de página (paper size) com base na configuração do arquivo
-            Global.default_min_paper_size = int(area_tuple[1])
+            area.default_min_paper_size = int(area_tuple[1])
             break  # Sai do loop após encontrar a área correspondente
 
-def init_everything():
-    # Inicializa várias configurações, incluindo o tamanho mínimo de artigo, conferências, listas manualmente classificadas, etc.
-    init_min_paper_size()    # Inicializa o tamanho mínimo de artigo
-    init_confs()             # Inicializa dados de conferências
-    init_black_list()        # Inicializa a lista negra de artigos a serem ignorados
-    init_white_list()        # Inicializa a lista branca de artigos a serem incluídos
+def init_area(area_prefix):
+    # Inicializa as configurações de uma área: tamanho mínimo de artigo, conferências, listas, etc.
+    area = Area(area_prefix)
+    init_min_paper_size(area)    # Inicializa o tamanho mínimo de artigo
+    init_confs(area)             # Inicializa dados de conferências
+    init_black_list(area)        # Inicializa a lista negra de artigos a serem ignorados
+    init_white_list(area)        # Inicializa a lista branca de artigos a serem incluídos
+    return area
+
+def init_worker(area_prefixes):
+    # Inicializa apenas a configuração necessária para classificar artigos (usado nos processos paralelos)
+    Global.areas = [init_area(a) for a in area_prefixes]
+    Global.venues = set(v for area in Global.areas for v in area.confdata)
     init_manual_files()      # Inicializa arquivos de classificação manual
-    init_arxiv_cache()       # Inicializa o cache de links do arXiv
-    init_prof_cache()        # Inicializa o cache de professores
+
+def init_config_hash(area):
+    # Tudo o que influencia quais artigos são indexáveis na área
+    area.config_hash = manifest.get_config_hash(STORE_FIRST_YEAR, STORE_LAST_YEAR, area.confdata,
+                                                area.black_list, area.white_list,
+                                                area.default_min_paper_size,
+                                                Global.manual_journals, Global.manual_classification)
+
+def init_everything(area_prefixes):
+    # Inicializa todas as áreas pedidas, os arquivos de classificação manual e os caches
+    init_worker(area_prefixes)
+    for area in Global.areas:
+        init_config_hash(area)       # Inicializa o hash usado pelo manifesto
+        init_prof_cache(area)        # Inicializa o cache de professores
+    Global.arxiv_cache = arxiv.load_cache()  # Inicializa o cache de links do arXiv
 
 # main loop that process each researcher
 
+def get_dblp_key(prof):
+    # Chave do XML do professor no cache da DBLP (espaços viram hífens)
+    return prof.replace(" ", "-")
+
+def get_dblp_file_name(prof):
+    # Caminho do arquivo XML no cache para o professor
+    return dblp_crawler.CACHE.get_file_name(get_dblp_key(prof))
+
+def fetch_dblp_file(pid, prof):
+    # Se o arquivo XML ainda não existe no cache, baixa da DBLP; retorna o caminho do arquivo
+    if not dblp_crawler.is_in_cache(get_dblp_key(prof)):
+        if dblp_crawler.Crawler(workers=1).fetch(pid.strip(), get_dblp_key(prof)) == "failed":
+            sys.exit(1)  # Encerra o programa se não foi possível baixar o arquivo
+    return get_dblp_file_name(prof)
+
 def read_dblp_file(pid, prof):
-    # Substitui espaços no nome do professor por hífens para formar o nome do arquivo
-    prof = prof.replace(" ", "-")
-    
-    # Define o caminho do arquivo XML no cache para o professor
-    file = '../../data/cache/dblp/' + prof + '.xml'
-    
-    # Se o arquivo XML já existe no cache, abre e lê seu conteúdo
-    if os.path.exists(file):
-        with open(file) as f:
-            dblp_xml = f.read()
-    else:
-        # Caso contrário, faz uma requisição à DBLP para obter o arquivo XML
-        try:
-            url = "http://dblp.org/pid/" + pid + ".xml"
-            dblp_xml = requests.get(url).text
-            # Salva o arquivo XML no cache local
-            with open(file, 'w') as f:
-                f.write(str(dblp_xml))
-        except requests.exceptions.RequestException as e:
-            print(e)
-            sys.exit(1)  # Encerra o programa se houver erro na requisição
-    return dblp_xml  # Retorna o conteúdo do arquivo XML
-
-def process_prof_with_paper(prof, dept):
+    # Retorna os registros do XML que podem ser indexados em alguma área, lidos do cache
+    # pré-processado sempre que o XML não mudou
+    return records.load_records(fetch_dblp_file(pid, prof), is_record_in_areas)
+
+def process_prof_with_paper(area, prof, dept):
     # Adiciona o professor e seu departamento à lista de professores
-    Global.profs_list.append((prof, dept))
+    area.profs_list.append((prof, dept))
     
     # Aumenta a contagem de professores no departamento correspondente
-    Global.profs[dept] += 1
+    area.profs[dept] += 1
     
-    # Chama a função para gerar o arquivo com os artigos do professor
-    output_prof_papers(prof)
-    
-    # Junta os artigos do professor e os salva em um único arquivo CSV
-    merge_output_prof_papers(prof)
+    # Guarda os artigos do professor no índice; os arquivos são gravados em output_search_files,
+    # depois que as citações foram preenchidas
+    Global.prof_papers.setdefault(prof, {})[area.area_prefix] = list(area.pid_papers)
 
-def process_department_data(dept):
-    # Se o departamento não tiver uma pontuação definida, inicializa com 0
-    if not dept in Global.score:
-        Global.score[dept] = 0.0
-    
+def process_department_data(area, dept):
     # Se o departamento não tiver sido registrado, inicializa a contagem de professores
-    if not dept in Global.profs:
-        Global.profs[dept] = 0
-
-def process_all_researchers():
-    global global_department, global_found_paper
+    if not dept in area.profs:
+        area.profs[dept] = 0
+
+def parse_researcher(researcher):
+    # Lê o XML de um pesquisador e retorna, para cada área, os artigos indexáveis e as falhas de classificação manual
+    # Não altera as pontuações, por isso pode rodar em um processo separado
+    prof = researcher[0]   # Nome do professor
+    pid = researcher[2]    # ID do professor na DBLP
+    return parse_researcher_records(read_dblp_file(pid, prof))
+
+def parse_researcher_records(dblp_records):
+    for area in Global.areas:
+        area.hits = []
+        area.mc_failed_papers = []
+    for dblp in dblp_records:
+        parse_dblp(None, dblp)
+    return [(area.hits, area.mc_failed_papers) for area in Global.areas]
+
+def parse_researcher_profiled(researcher):
+    # parse_researcher com as medidas do --profile: tempo, registros lidos, registros descartados
+    # pelo filtro rápido e, em cada área, artigos indexados e rejeitados por motivo
+    start = time.perf_counter()
+    all_records = records.load_records(fetch_dblp_file(researcher[2], researcher[0]))
+    dblp_records = []
+    prefiltered = {}
+    for dblp in all_records:
+        rejection = get_record_rejection(dblp)
+        if rejection is None:
+            dblp_records.append(dblp)
+        else:
+            prefiltered[rejection] = prefiltered.get(rejection, 0) + 1
+    for area in Global.areas:
+        area.rejections = {}
+    result = parse_researcher_records(dblp_records)
+    stats = {'prof': researcher[0], 'cached': False, 'seconds': round(time.perf_counter() - start, 6),
+             'records': len(all_records), 'prefiltered': prefiltered,
+             'areas': {area.area_prefix: {'indexed': len(area.hits), 'rejections': area.rejections}
+                       for area in Global.areas}}
+    for area in Global.areas:
+        area.rejections = None
+    return result, stats
+
+def download_missing_files(researchers):
+    # Baixa antes os XMLs que não estão no cache, para que os processos paralelos só leiam arquivos locais
+    for researcher in researchers:
+        if not dblp_crawler.is_in_cache(get_dblp_key(researcher[0])):
+            read_dblp_file(researcher[2], researcher[0])
+
+def parse_researchers(researchers, workers):
+    # Lê os XMLs dos pesquisadores, em paralelo se workers > 1; os resultados ficam na ordem da lista
+    parse = parse_researcher if Global.profile is None else parse_researcher_profiled
+    if workers <= 1 or len(researchers) <= 1:
+        parsed = [parse(r) for r in researchers]
+    else:
+        with multiprocessing.Pool(workers, initializer=init_worker,
+                                  initargs=([a.area_prefix for a in Global.areas],)) as pool:
+            parsed = pool.map(parse, researchers, chunksize=1)
+    if Global.profile is None:
+        return parsed
+    # Com --profile, as medidas de cada pesquisador voltam junto com o resultado
+    for _, stats in parsed:
+        Global.profile.add_researcher(stats)
+    return [result for result, _ in parsed]
+
+def is_in_window(year):
+    return Global.first_year <= year <= Global.last_year
+
+def add_researcher_results(researcher, result):
+    # Contabiliza em todas as áreas o resultado de parse_researcher; retorna True se o pesquisador tem artigos
+    prof = researcher[0]   # Nome do professor
+    dept = researcher[1]   # Departamento do professor
+
+    for area, (area_hits, mc_failed_papers) in zip(Global.areas, result):
+        # Os resultados têm todos os anos do índice; só a janela das saídas é contabilizada
+        window_hits = [hit for hit in area_hits if is_in_window(hit[1])]
+        if Global.profile is not None:
+            outside = Global.profile.outside_window
+            outside[area.area_prefix] = outside.get(area.area_prefix, 0) + len(area_hits) - len(window_hits)
+        area_hits = window_hits
+        # Registra as falhas de classificação de jornais multi-área
+        for year, dblp_venue, title, url in mc_failed_papers:
+            if is_in_window(year):
+                output_mc_failed(year, dblp_venue, title, url)
+        # Processa os dados do departamento do professor
+        process_department_data(area, dept)
+        # Contabiliza os artigos do professor na área
+        add_researcher_papers(area, dept, area_hits)
     
+    # Para cada área em que um artigo foi encontrado, processa o professor e seus artigos
+    found_areas = [area for area in Global.areas if area.found_paper]
+    for area in found_areas:
+        process_prof_with_paper(area, prof, dept)
+    return len(found_areas) > 0
+
+def process_all_researchers(workers=1, incremental=True):
     # Lê o arquivo com todos os pesquisadores
-    all_researchers = csv.reader(open("../../data/configs/all-researchers.csv", 'r'))
+    all_researchers = list(csv.reader(open("../../data/configs/all-researchers.csv", 'r')))
     count = 1
-    print("Research Area: " + Global.area_prefix)  # Exibe a área de pesquisa
+    print("Research Area: " + ", ".join(a.area_prefix for a in Global.areas))  # Exibe as áreas de pesquisa
+
+    # Reaproveita os resultados dos pesquisadores cujo XML e configuração não mudaram
+    with profile_stage("download"):
+        download_missing_files(all_researchers)
+    with profile_stage("manifest"):
+        area_hashes = [(a.area_prefix, a.config_hash) for a in Global.areas]
+        researchers_manifest = manifest.load_manifest() if incremental else {}
+        # O sha1 de cada XML fica no índice do cache e só é recalculado quando o arquivo muda
+        sha1s = [dblp_crawler.CACHE.sha1(get_dblp_key(r[0])) for r in all_researchers]
+        results = [manifest.get_cached_results(researchers_manifest, r[0], r[2], sha1, area_hashes)
+                   for r, sha1 in zip(all_researchers, sha1s)]
+    changed = [i for i in range(len(all_researchers)) if results[i] is None]
+    print(str(len(changed)) + " of " + str(len(all_researchers)) + " researchers changed")
+    if Global.profile is not None:
+        for researcher, result in zip(all_researchers, results):
+            if result is not None:
+                Global.profile.add_researcher({'prof': researcher[0], 'cached': True, 'areas': {
+                    a.area_prefix: {'indexed': len(hits)} for a, (hits, _) in zip(Global.areas, result)}})
+
+    # Os XMLs são lidos (em paralelo, se pedido); os resultados voltam na ordem do CSV, então as
+    # pontuações são somadas exatamente como na execução serial
+    with profile_stage("parse"):
+        parsed = parse_researchers([all_researchers[i] for i in changed], workers)
+    for i, result in zip(changed, parsed):
+        results[i] = result
+        manifest.update_entry(researchers_manifest, all_researchers[i][0], all_researchers[i][2],
+                              sha1s[i], area_hashes, result)
+
+    # Consulta o arXiv antes da contagem, que então só lê o cache
+    with profile_stage("arxiv"):
+        resolve_arxiv_urls(results)
     
     # Itera sobre todos os pesquisadores
-    for researcher in all_researchers:
-        prof = researcher[0]   # Nome do professor
-        global_department = researcher[1]   # Departamento do professor
-        pid = researcher[2]    # ID do professor na DBLP
-        
-        # Processa os dados do departamento do professor
-        process_department_data(global_department)
-        
-        # Lê o arquivo XML do DBLP para o professor
-        bibfile = read_dblp_file(pid, prof)
-        
-        # Reseta a lista de artigos do professor
-        Global.pid_papers = []
-        global_found_paper = False    # Variável global para indicar se o artigo foi encontrado
-        
-        # Converte o XML para dicionário e processa os artigos
-        xmltodict.parse(bibfile, item_depth=3, item_callback=parse_dblp)
-        
-        # Se um artigo foi encontrado, processa o professor e seus artigos
-        if global_found_paper:
-            process_prof_with_paper(prof, global_department)
-            print(str(count) + " >> " + prof + ", " + global_department)  # Exibe o progresso
-        
-        count = count + 1  # Aumenta o contador de pesquisadores processados
+    with profile_stage("count"):
+        for researcher, result in zip(all_researchers, results):
+            if add_researcher_results(researcher, result):
+                print(str(count) + " >> " + researcher[0] + ", " + researcher[1])  # Exibe o progresso
+            count = count + 1  # Aumenta o contador de pesquisadores processados
+
+    # Guarda o manifesto apenas com os pesquisadores atuais
+    current = set(r[0] for r in all_researchers)
+    manifest.save_manifest({p: e for p, e in researchers_manifest.items() if p in current})
+    dblp_crawler.CACHE.flush()
+    # Guarda os artigos de todos os anos de cada área, para store.py consultar outras janelas
+    with profile_stage("store"):
+        for i, area in enumerate(Global.areas):
+            store.save_area(area.area_prefix, area.config_hash, all_researchers, [r[i][0] for r in results])
+
+def get_configured_areas():
+    # Áreas de research-areas-config.csv que têm um arquivo <area>-confs.csv
+    reader = csv.reader(open("../../data/configs/research-areas-config.csv", 'r'))
+    return [a[0] for a in reader if os.path.exists("../../data/" + a[0] + "-confs.csv")]
+
+def get_area_prefixes(args):
+    # "-all" processa todas as áreas configuradas
+    if args.all:
+        return get_configured_areas()
+    return args.areas
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Calcula as pontuações dos departamentos a partir dos arquivos da DBLP")
+    parser.add_argument("areas", nargs="*", help="prefixos das áreas de pesquisa (ex: cs robotics)")
+    parser.add_argument("-all", action="store_true", help="processa todas as áreas configuradas")
+    parser.add_argument("--workers", type=int, default=1, help="número de processos para ler os XMLs")
+    parser.add_argument("--full", action="store_true", help="ignora o manifesto e relê todos os XMLs")
+    parser.add_argument("--fetch-citations", action="store_true",
+                        help="busca no Semantic Scholar as citações dos artigos que não estão no cache")
+    parser.add_argument("--profile", nargs="?", const=instrument.REPORT_FILE,
+                        default=os.environ.get("SEARCH_PROFILE"), metavar="ARQUIVO",
+                        help="mede tempos e filtros e grava um relatório JSON (padrão: " + instrument.REPORT_FILE + ")")
+    parser.add_argument("--profile-dump", metavar="ARQUIVO",
+                        help="perfil de todas as funções do processo principal: cProfile (.prof) ou pyinstrument (.html)")
+    args = parser.parse_args()
+    if not args.areas and not args.all:
+        parser.error("informe ao menos uma área ou -all")
+    if args.profile == "1":   # SEARCH_PROFILE=1 usa o arquivo padrão
+        args.profile = instrument.REPORT_FILE
+    return args
 
 # main program
-
-init_everything()
-process_all_researchers()
-outuput_everything()
\ No newline at end of file
+# How to use (from src/DBLP):
+# python search.py cs                (uma área)
+# python search.py cs robotics mech  (várias áreas com uma única leitura dos XMLs)
+# python search.py -all              (todas as áreas configuradas)
+# python search.py -all --workers 8  (lê os XMLs em 8 processos)
+# python search.py -all --full       (relê todos os XMLs, sem usar o manifesto da última execução)
+# python search.py -all --fetch-citations  (busca as citações que faltam no cache do Semantic Scholar)
+# python search.py -all --profile    (grava tempos e contagens dos filtros em data/cache/search-profile.json)
+# python search.py cs --profile --profile-dump cs.prof  (também grava o perfil do cProfile)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.profile:
+        Global.profile = instrument.Profile(args.profile)
+    with instrument.code_profiler(args.profile_dump):
+        with profile_stage("init"):
+            init_everything(get_area_prefixes(args))
+        process_all_researchers(args.workers, not args.full)
+        with profile_stage("citations"):
+            enrich_citations(args.fetch_citations)
+        with profile_stage("output"):
+            outuput_everything()
+    print(cache.format_stats("dblp", dblp_crawler.CACHE.stats()))
+    print(cache.format_stats("arxiv", Global.arxiv_cache.stats()))
+    if Global.profile is not None:
+        Global.profile.caches = {'dblp': dblp_crawler.CACHE.stats(), 'arxiv': Global.arxiv_cache.stats()}
+        Global.profile.write_report()
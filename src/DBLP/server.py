@@ -0,0 +1,371 @@
+# Servidor HTTP local para consultar os rankings sem rodar o search.py de novo
+#
+# Carrega de cada área a tabela de artigos (scoring.load_table, de <area>-out-papers.csv), os
+# artigos de cada professor (papers/<area>-<prof>-papers.csv) e o departamento de cada professor
+# (<area>-out-profs-list.csv), e monta índices das linhas da tabela por ano, nível, tipo, local e
+# departamento. Cada consulta junta os índices dos filtros pedidos e pontua só as linhas
+# selecionadas. As respostas (JSON) ficam em um cache LRU; quando algum arquivo de uma área muda,
+# a área é recarregada e o cache é limpo.
+#
+# How to use (from src/DBLP, depois do search.py):
+# python server.py -all                             (http://127.0.0.1:8000)
+# python server.py robotics cs --port 8080
+# python server.py -all --check                     (confere /ranking?by=prof com os CSVs e sai)
+#
+# Consultas (parâmetros repetidos, ex: tier=top&tier=near-top, valem como "ou"):
+# /areas
+# /ranking?area=robotics&years=2022-2024&tier=top       (departamentos; by=prof para professores)
+# /profs?area=cs&dept=UFMG                              (professores, com pontuação e artigos)
+# /papers?area=cs&dept=UFMG&years=2024&type=J&limit=20&offset=0
+# Filtros: years (ano ou INICIO-FIM), tier (top, near-top, null), type (C, J), venue, dept, scheme
+# (esquemas de scoring.SCHEMES)
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import threading
+import collections
+import urllib.request
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import scoring
+import bundles
+
+DATA_DIR = '../../data/'
+PAPERS_DIR = DATA_DIR + 'configs/profs/papers/'
+CACHE_SIZE = 512                # Respostas guardadas no cache LRU
+RELOAD_INTERVAL = 1.0           # Intervalo mínimo (segundos) entre as verificações dos arquivos
+PAPERS_LIMIT = 100              # Artigos por resposta, se limit não for informado
+
+class QueryError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def get_area_files(area_prefix):
+    return [DATA_DIR + area_prefix + '-out-papers.csv', DATA_DIR + area_prefix + '-confs.csv',
+            DATA_DIR + area_prefix + '-out-profs-list.csv', PAPERS_DIR]
+
+def get_mtimes(files):
+    # Data de modificação dos arquivos (None se não existe); a pasta papers/ muda quando um arquivo
+    # de professor é criado ou apagado
+    mtimes = []
+    for file in files:
+        try:
+            mtimes.append(os.stat(file).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+def add_to_index(index, key, row):
+    index.setdefault(key, []).append(row)
+
+class AreaIndex:
+    def __init__(self, area_prefix):
+        self.area_prefix = area_prefix
+        self.mtimes = get_mtimes(get_area_files(area_prefix))
+        table = self.table = scoring.load_table(area_prefix)
+        # Só os professores de <area>-out-profs-list.csv; a pasta papers/ pode ter arquivos antigos
+        self.prof_depts = scoring.load_profs(area_prefix)
+        self.prof_rows = scoring.load_prof_rows(area_prefix, table, self.prof_depts)
+
+        # Índices: valor -> linhas da tabela, em ordem crescente
+        self.by_year = {}
+        self.by_tier = {}
+        self.by_type = {}
+        self.by_venue = {}
+        self.by_dept = {}
+        depts = table.depts.names
+        for row in range(len(table)):
+            weight = table.weights[row]
+            add_to_index(self.by_year, table.years[row], row)
+            add_to_index(self.by_tier, scoring.TIER_BY_WEIGHT[weight], row)
+            add_to_index(self.by_type, scoring.TYPE_BY_WEIGHT[weight], row)
+            add_to_index(self.by_venue, table.get_venue(row), row)
+            for dept_id in table.get_dept_ids(row):
+                add_to_index(self.by_dept, depts[dept_id], row)
+        self.by_prof_dept = {}
+        for prof in sorted(self.prof_rows):
+            add_to_index(self.by_prof_dept, self.prof_depts.get(prof, ""), prof)
+
+    def is_outdated(self):
+        return get_mtimes(get_area_files(self.area_prefix)) != self.mtimes
+
+    def select(self, query):
+        # Linhas que passam em todos os filtros, em ordem crescente (a ordem de <area>-out-papers.csv)
+        selected = None
+        for index, values in ((self.by_year, query['years']), (self.by_tier, query['tiers']),
+                              (self.by_type, query['types']), (self.by_venue, query['venues']),
+                              (self.by_dept, query['depts'])):
+            if values is None:
+                continue
+            rows = set()
+            for value in values:
+                rows.update(index.get(value, ()))
+            selected = rows if selected is None else selected & rows
+            if not selected:
+                return []
+        if selected is None:
+            return range(len(self.table))
+        return sorted(selected)
+
+    def rank_depts(self, query, rows):
+        # Pontuação dos departamentos só com as linhas selecionadas; com o filtro dept, só desses
+        table = self.table
+        lookup = scoring.get_lookup(query['scheme'])
+        totals = collections.defaultdict(float)
+        depts = table.depts.names
+        for row in rows:
+            p = lookup[table.weights[row]]
+            for dept_id in table.get_dept_ids(row):
+                totals[depts[dept_id]] += p
+        if query['depts'] is not None:
+            totals = {dept: s for dept, s in totals.items() if dept in query['depts']}
+        return scoring.rank(totals)
+
+    def get_profs(self, query, rows):
+        # Professores dos departamentos pedidos, com pontuação e número de artigos nas linhas selecionadas
+        table = self.table
+        lookup = scoring.get_lookup(query['scheme'])
+        selected = set(rows)
+        if query['depts'] is None:
+            profs = sorted(self.prof_rows)
+        else:
+            profs = [p for dept in sorted(query['depts']) for p in self.by_prof_dept.get(dept, ())]
+        result = {}
+        for prof in profs:
+            prof_rows = [row for row in self.prof_rows[prof] if row in selected]
+            if prof_rows:
+                result[prof] = (sum(lookup[table.weights[row]] for row in prof_rows), len(prof_rows))
+        return result
+
+    def get_paper(self, row):
+        table = self.table
+        weight = table.weights[row]
+        return {'year': table.years[row], 'venue': table.get_venue(row), 'title': table.titles[row][1:-1],
+                'depts': [table.depts.names[i] for i in table.get_dept_ids(row)],
+                'authors': list(table.authors[row]), 'doi': table.dois[row],
+                'tier': scoring.TIER_BY_WEIGHT[weight], 'type': scoring.TYPE_BY_WEIGHT[weight],
+                'arxiv': table.arxiv_urls[row], 'citations': table.citations[row]}
+
+# Leitura dos parâmetros
+
+def get_years(values):
+    # "2022-2024" ou "2022"; retorna a lista de anos do intervalo
+    years = set()
+    for value in values:
+        first, _, last = value.partition('-')
+        try:
+            first = int(first)
+            last = int(last) if last else first
+        except ValueError:
+            raise QueryError("years: use ANO ou INICIO-FIM")
+        if first > last:
+            raise QueryError("years: o primeiro ano deve ser menor ou igual ao último")
+        years.update(range(first, last + 1))
+    return years
+
+def get_int(params, name, default):
+    try:
+        value = int(params[name][-1]) if name in params else default
+    except ValueError:
+        raise QueryError(name + ": número inválido")
+    if value < 0:
+        raise QueryError(name + ": número inválido")
+    return value
+
+def get_query(params):
+    query = {'years': get_years(params['years']) if 'years' in params else None,
+             'tiers': params.get('tier'), 'types': params.get('type'),
+             'venues': params.get('venue'), 'depts': params.get('dept')}
+    for name, values, allowed in (('tier', query['tiers'], scoring.TIERS), ('type', query['types'], ('C', 'J'))):
+        for value in values or ():
+            if value not in allowed:
+                raise QueryError(name + ": use " + ", ".join(allowed))
+    scheme = params.get('scheme', ['default'])[-1]
+    if scheme not in scoring.SCHEMES:
+        raise QueryError("scheme: use " + ", ".join(sorted(scoring.SCHEMES)))
+    query['scheme'] = scoring.SCHEMES[scheme]
+    for name in ('years', 'tiers', 'types', 'venues', 'depts'):
+        if query[name] is not None:
+            query[name] = frozenset(query[name])
+    return query
+
+def get_area(areas, params):
+    if 'area' not in params:
+        raise QueryError("informe a área (area=)")
+    area_prefix = params['area'][-1]
+    if area_prefix not in areas:
+        raise QueryError("área desconhecida: " + area_prefix, 404)
+    return areas[area_prefix]
+
+class RankingServer:
+    def __init__(self, area_prefixes):
+        self.area_prefixes = area_prefixes
+        self.areas = {}
+        self.cache = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.last_check = 0.0
+        self.reloads = 0
+        for area_prefix in area_prefixes:
+            self.areas[area_prefix] = AreaIndex(area_prefix)
+
+    def check_reload(self):
+        # Recarrega as áreas cujos arquivos mudaram; chamada com o lock
+        now = time.monotonic()
+        if now - self.last_check < RELOAD_INTERVAL:
+            return
+        self.last_check = now
+        for area_prefix, area in self.areas.items():
+            if area.is_outdated():
+                self.areas[area_prefix] = AreaIndex(area_prefix)
+                self.reloads += 1
+                self.cache.clear()
+                print("reloaded " + area_prefix, file=sys.stderr)
+
+    def get_response(self, path, params):
+        # Retorna (status, corpo JSON, se veio do cache)
+        key = (path, tuple(sorted((k, tuple(v)) for k, v in params.items())))
+        with self.lock:
+            self.check_reload()
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+                return cached + (True,)
+            areas = dict(self.areas)
+        try:
+            response = (200, bundles.encode(self.run_query(areas, path, params)))
+        except QueryError as e:
+            response = (e.status, bundles.encode({'error': str(e)}))
+        with self.lock:
+            self.cache[key] = response
+            if len(self.cache) > CACHE_SIZE:
+                self.cache.popitem(last=False)
+        return response + (False,)
+
+    def run_query(self, areas, path, params):
+        # areas: cópia do dicionário de áreas, para uma recarga no meio da consulta não afetá-la
+        if path == '/areas':
+            return {'areas': [{'area': a.area_prefix, 'papers': len(a.table), 'profs': len(a.prof_rows),
+                               'depts': len(a.by_dept), 'years': sorted(a.by_year)} for a in areas.values()]}
+        if path not in ('/ranking', '/profs', '/papers'):
+            raise QueryError("consulta desconhecida: " + path, 404)
+        area = get_area(areas, params)
+        query = get_query(params)
+        rows = area.select(query)
+        if path == '/ranking':
+            by = params.get('by', ['dept'])[-1]
+            if by == 'dept':
+                ranking = area.rank_depts(query, rows)
+            elif by == 'prof':
+                ranking = scoring.rank({prof: s for prof, (s, n) in area.get_profs(query, rows).items()})
+            else:
+                raise QueryError("by: use dept ou prof")
+            top = get_int(params, 'top', len(ranking))
+            return {'area': area.area_prefix, 'by': by,
+                    'ranking': [{'name': name, 'score': round(s, 2)} for name, s in ranking[:top]]}
+        if path == '/profs':
+            profs = area.get_profs(query, rows)
+            return {'area': area.area_prefix,
+                    'profs': [{'name': prof, 'dept': area.prof_depts.get(prof, ""), 'score': round(s, 2),
+                               'papers': n} for prof, (s, n) in sorted(profs.items())]}
+        offset = get_int(params, 'offset', 0)
+        limit = get_int(params, 'limit', PAPERS_LIMIT)
+        return {'area': area.area_prefix, 'count': len(rows), 'offset': offset,
+                'papers': [area.get_paper(row) for row in rows[offset:offset + limit]]}
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "CSIndexbrRanking/1"
+
+    def do_GET(self):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        status, body, cached = self.server.ranking.get_response(url.path.rstrip('/') or '/', parse_qs(url.query))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("X-Cache", "hit" if cached else "miss")
+        self.send_header("Server-Timing", f"query;dur={(time.perf_counter() - start) * 1000:.2f}")
+        self.end_headers()
+        self.wfile.write(body)
+
+# Conferência (--check): o ranking de professores do servidor, consultado por HTTP, deve ter os
+# professores de <area>-out-profs-list.csv, uma vez cada, com a soma dos pesos das linhas de
+# papers/<area>-<prof>-papers.csv
+
+def get_expected_prof_scores(area_prefix):
+    weights = scoring.read_weights(area_prefix)
+    scores = {}
+    for prof in scoring.load_profs(area_prefix):
+        file_name = PAPERS_DIR + area_prefix + "-" + prof.replace(" ", "-") + "-papers.csv"
+        score = 0.0
+        if os.path.exists(file_name):
+            with open(file_name, encoding="utf-8", newline='') as f:
+                score = sum(scoring.get_paper_score(weights.get(r[1], 0)) for r in csv.reader(f) if len(r) >= 3)
+        scores[prof] = round(score, 2)
+    return scores
+
+def check(area_prefixes, host):
+    httpd = ThreadingHTTPServer((host, 0), Handler)
+    httpd.ranking = RankingServer(area_prefixes)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    errors = 0
+    try:
+        for area_prefix in area_prefixes:
+            url = f"http://{host}:{httpd.server_port}/ranking?area={area_prefix}&by=prof"
+            with urllib.request.urlopen(url) as response:
+                ranking = json.load(response)['ranking']
+            names = [r['name'] for r in ranking]
+            got = {r['name']: r['score'] for r in ranking}
+            expected = get_expected_prof_scores(area_prefix)
+            problems = []
+            if len(names) != len(got):
+                problems.append("professores repetidos: " + ", ".join(sorted(set(n for n in names if names.count(n) > 1))))
+            for prof in sorted(set(got) | set(expected)):
+                if got.get(prof) != expected.get(prof):
+                    problems.append(f"{prof}: servidor {got.get(prof)}, esperado {expected.get(prof)}")
+            errors += len(problems)
+            print(f"{area_prefix}: {len(got)} professores, " + ("ok" if not problems else f"{len(problems)} diferenças"))
+            for problem in problems:
+                print("  " + problem)
+    finally:
+        httpd.shutdown()
+    return errors == 0
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Servidor HTTP local para consultar os rankings das áreas")
+    parser.add_argument("areas", nargs="*", help="prefixos das áreas de pesquisa (ex: cs robotics)")
+    parser.add_argument("-all", action="store_true", help="todas as áreas configuradas com saídas do search.py")
+    parser.add_argument("--host", default="127.0.0.1", help="endereço (padrão: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="porta (padrão: 8000)")
+    parser.add_argument("--check", action="store_true",
+                        help="confere o ranking de professores com <area>-out-profs-list.csv e sai")
+    args = parser.parse_args()
+    if not args.areas and not args.all:
+        parser.error("informe ao menos uma área ou -all")
+    return args
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.all:
+        import search
+        area_prefixes = [a for a in search.get_configured_areas()
+                         if os.path.exists(DATA_DIR + a + '-out-papers.csv')]
+    else:
+        area_prefixes = args.areas
+    if args.check:
+        sys.exit(0 if check(area_prefixes, args.host) else 1)
+    start = time.perf_counter()
+    ranking = RankingServer(area_prefixes)
+    print(f"{', '.join(area_prefixes)}: loaded in {(time.perf_counter() - start) * 1000:.0f} ms", file=sys.stderr)
+    httpd = ThreadingHTTPServer((args.host, args.port), Handler)
+    httpd.ranking = ranking
+    print(f"http://{args.host}:{args.port}/", file=sys.stderr)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,148 @@
+# Índice por ano dos artigos indexáveis de cada área, de todos os anos, gravado pelo search.py
+#
+# O search.py lê dos XMLs os artigos de STORE_FIRST_YEAR a STORE_LAST_YEAR, mas só conta nas saídas
+# os de FIRST_YEAR a LAST_YEAR. A cada execução ele grava aqui, por área, todos os artigos
+# encontrados (os mesmos "hits" de parse_researcher, na ordem dos pesquisadores no CSV), o
+# pesquisador de cada artigo e, para cada ano, as posições dos artigos daquele ano.
+#
+# run_query() gera os arquivos <area>-out-*.csv de qualquer janela de anos a partir do índice:
+# junta as posições dos anos pedidos e refaz a contagem do search.py só com esses artigos, sem
+# ler nenhum XML. Se a configuração da área mudou desde a última execução do search.py, o índice
+# não vale mais e é preciso rodar o search.py de novo.
+#
+# How to use (from src/DBLP, depois do search.py):
+# python store.py cs --years 2015 2019           (grava em data/years/2015-2019/cs-out-*.csv)
+# python store.py -all --years 2023 2025 --output /tmp/rank
+
+import os
+import sys
+import time
+import marshal
+import argparse
+from array import array
+import cache
+
+STORE_DIR = '../../data/cache/store/'
+OUTPUT_DIR = '../../data/years/'
+VERSION = 1
+
+def get_store_file_name(area_prefix):
+    return STORE_DIR + area_prefix + '.bin'
+
+def save_area(area_prefix, config_hash, researchers, area_results):
+    # area_results: artigos (hits) da área de cada pesquisador, na ordem de researchers
+    owners = array('I')
+    hits = []
+    years = {}
+    for i, area_hits in enumerate(area_results):
+        for hit in area_hits:
+            years.setdefault(hit[1], array('I')).append(len(hits))
+            owners.append(i)
+            hits.append(hit)
+    data = {'version': VERSION, 'config_hash': config_hash,
+            'researchers': [(r[0], r[1]) for r in researchers],
+            'owners': owners.tobytes(), 'hits': hits,
+            'years': {year: positions.tobytes() for year, positions in years.items()}}
+    os.makedirs(STORE_DIR, exist_ok=True)
+    cache.write_atomic(get_store_file_name(area_prefix), marshal.dumps(data))
+
+class AreaStore:
+    def __init__(self, data):
+        self.config_hash = data['config_hash']
+        self.researchers = data['researchers']  # (nome, departamento), na ordem do CSV
+        self.owners = array('I')                # Pesquisador (posição em researchers) de cada artigo
+        self.owners.frombytes(data['owners'])
+        self.hits = data['hits']
+        self.years = {}                         # Ano -> posições dos artigos do ano
+        for year, positions in data['years'].items():
+            self.years[year] = array('I')
+            self.years[year].frombytes(positions)
+
+    def get_positions(self, first_year, last_year):
+        # Posições dos artigos da janela, na ordem em que foram encontrados
+        positions = []
+        for year, year_positions in self.years.items():
+            if first_year <= year <= last_year:
+                positions.extend(year_positions)
+        positions.sort()
+        return positions
+
+    def get_results(self, first_year, last_year):
+        # Artigos da janela de cada pesquisador, na ordem de researchers
+        results = [[] for _ in self.researchers]
+        for position in self.get_positions(first_year, last_year):
+            results[self.owners[position]].append(self.hits[position])
+        return results
+
+def load_area(area_prefix):
+    # Retorna o AreaStore da área, ou None se o índice não existe ou é de outra versão
+    file = get_store_file_name(area_prefix)
+    if not os.path.exists(file):
+        return None
+    with open(file, 'rb') as f:
+        try:
+            data = marshal.load(f)
+        except (EOFError, ValueError, TypeError):
+            return None
+    if not isinstance(data, dict) or data.get('version') != VERSION:
+        return None
+    return AreaStore(data)
+
+def run_query(area_prefixes, first_year, last_year, output_dir):
+    # Gera os <area>-out-*.csv da janela em output_dir, com as funções de contagem e saída do search.py
+    import search
+    search.Global.first_year = first_year
+    search.Global.last_year = last_year
+    search.Global.output_dir = output_dir
+    search.init_worker(area_prefixes)
+    search.Global.arxiv_cache = search.arxiv.load_cache()
+    areas = search.Global.areas
+    stores = []
+    for area in areas:
+        search.init_config_hash(area)
+        area_store = load_area(area.area_prefix)
+        if area_store is None or area_store.config_hash != area.config_hash:
+            print(area.area_prefix + ": the paper store is missing or out of date; run search.py " + area.area_prefix)
+            sys.exit(1)
+        stores.append(area_store)
+    # Cada área é contada separadamente, porque os índices podem ser de execuções diferentes
+    for area, area_store in zip(areas, stores):
+        search.Global.areas = [area]
+        for researcher, hits in zip(area_store.researchers, area_store.get_results(first_year, last_year)):
+            search.add_researcher_results(researcher, [(hits, [])])
+    search.Global.areas = areas
+    search.enrich_citations()
+    os.makedirs(output_dir, exist_ok=True)
+    for area in areas:
+        search.output_papers(area)
+        search.output_scores(area)
+        search.output_venues(area)
+        search.output_profs_list(area)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Gera as saídas de uma janela de anos a partir do índice de artigos")
+    parser.add_argument("areas", nargs="*", help="prefixos das áreas de pesquisa (ex: cs robotics)")
+    parser.add_argument("-all", action="store_true", help="todas as áreas configuradas")
+    parser.add_argument("--years", type=int, nargs=2, required=True, metavar=("INICIO", "FIM"),
+                        help="primeiro e último ano da janela")
+    parser.add_argument("--output", help="pasta das saídas (padrão: data/years/INICIO-FIM/)")
+    args = parser.parse_args()
+    if not args.areas and not args.all:
+        parser.error("informe ao menos uma área ou -all")
+    if args.years[0] > args.years[1]:
+        parser.error("o primeiro ano deve ser menor ou igual ao último")
+    return args
+
+if __name__ == "__main__":
+    args = parse_args()
+    first_year, last_year = args.years
+    output_dir = args.output or OUTPUT_DIR + str(first_year) + "-" + str(last_year)
+    output_dir = os.path.join(output_dir, "")
+    start = time.perf_counter()
+    if args.all:
+        import search
+        area_prefixes = search.get_configured_areas()
+    else:
+        area_prefixes = args.areas
+    run_query(area_prefixes, first_year, last_year, output_dir)
+    print(f"{first_year}-{last_year}: {output_dir} in {(time.perf_counter() - start) * 1000:.0f} ms")
@@ -1,5 +1,5 @@
 import os
-import xmltodict
+import records
 
 def journals_without_pages(directory):
     journals = set()
@@ -7,25 +7,15 @@ def journals_without_pages(directory):
     for filename in os.listdir(directory):
         if filename.endswith(".xml"):
             path = os.path.join(directory, filename)
-            with open(path, "r", encoding="utf-8") as file:
-                try:
-                    data = xmltodict.parse(file.read())
-                    
-                    # Acessa a raiz do XML, que é <dblpperson>
-                    records = data.get("dblpperson", {}).get("r", [])
-                    
-                    # Se houver só um <r>, transforma em lista
-                    if isinstance(records, dict):
-                        records = [records]
-                    
-                    for r in records:
-                        article = r.get("article")
-                        if article:
-                            if "journal" in article and "pages" not in article:
-                                journals.add(article["journal"])
-
-                except Exception as e:
-                    print(f"Erro ao processar {filename}: {e}")
+            try:
+                # Registros lidos do cache pré-processado (records.py)
+                for r in records.load_records(path):
+                    if r["type"] == "article":
+                        if "journal" in r and "pages" not in r:
+                            journals.add(r["journal"])
+
+            except Exception as e:
+                print(f"Erro ao processar {filename}: {e}")
 
     return journals
 
@@ -0,0 +1,85 @@
+# Cliente da API do Semantic Scholar usado pelos scripts desta pasta
+#
+# Uma única sessão HTTP (conexões reaproveitadas) é compartilhada por todas as threads, com um
+# limite de requisições por segundo comum a todas. Respostas 429 e 5xx, e erros de rede, são
+# repetidas com espera (Retry-After, se o servidor mandar, ou backoff exponencial); depois de
+# MAX_RETRIES tentativas a requisição é dada como falha, sem encerrar o programa.
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+# O limite de requisições e a espera entre tentativas são os mesmos do dblp.py
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DBLP'))
+from dblp import TokenBucket, get_retry_wait, MAX_RETRIES, RETRY_STATUS
+
+API_URL = "https://api.semanticscholar.org/graph/v1/"
+PAPER_FIELDS = "title,year,venue,authors,citationCount,url"
+PAGE_SIZE = 1000                # Máximo da API para /author/{id}/papers
+TIMEOUT = 30
+
+class Crawler:
+    # Sem chave, a API pública aceita cerca de uma requisição por segundo
+    def __init__(self, url=API_URL, rate=1.0, workers=4, api_key=None):
+        self.url = url
+        self.bucket = TokenBucket(rate)
+        self.workers = workers
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        api_key = api_key or os.environ.get('S2_API_KEY')
+        if api_key:
+            self.session.headers['x-api-key'] = api_key
+
+    def get(self, path, params):
+        # Retorna o JSON da resposta, ou None se a requisição falhou
+        response = None
+        for attempt in range(MAX_RETRIES):
+            self.bucket.acquire()
+            try:
+                response = self.session.get(self.url + path, params=params, timeout=TIMEOUT)
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code not in RETRY_STATUS:
+                    print(f"{path}: HTTP {response.status_code}")
+                    return None
+                print(f"{path}: HTTP {response.status_code}, tentando de novo")
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"{path}: {e}")
+                response = None
+            if attempt < MAX_RETRIES - 1:  # Não espera depois da última tentativa
+                time.sleep(get_retry_wait(response, attempt))
+        return None
+
+    def get_pages(self, path, params, page_size, max_results=None):
+        # Junta as páginas de uma consulta paginada por offset; retorna None se alguma página falhou
+        data = []
+        offset = 0
+        while max_results is None or offset < max_results:
+            limit = page_size if max_results is None else min(page_size, max_results - offset)
+            page = self.get(path, dict(params, offset=offset, limit=limit))
+            if page is None:
+                return None
+            data.extend(page.get('data') or [])
+            if 'next' not in page:
+                break
+            offset = page['next']
+        return data
+
+    def get_author_papers(self, author_id, fields=PAPER_FIELDS):
+        # Todos os artigos do autor, no mesmo formato da resposta da API ({"offset", "data"})
+        data = self.get_pages("author/" + str(author_id) + "/papers", {'fields': fields}, PAGE_SIZE)
+        if data is None:
+            return None
+        return {'offset': 0, 'data': data}
+
+    def search_papers(self, query, fields, max_results=100):
+        return self.get_pages("paper/search", {'query': query, 'fields': fields}, 100, max_results)
+
+    def map(self, func, items):
+        # Aplica func a cada item em paralelo (workers threads); resultados na ordem dos itens
+        with ThreadPoolExecutor(self.workers) as pool:
+            return list(pool.map(func, items))
@@ -1,59 +1,40 @@
 import csv
-import time
-import requests
+from crawler import Crawler
 
 # Função para buscar artigos no Semantic Scholar, filtrando por universidade e tema
-def search_articles_by_university_and_topic(university_sigla, topic_keywords, start_year=2020, end_year=2025, max_results=100):
-    url = "https://api.semanticscholar.org/graph/v1/paper/search"
+def search_articles_by_university_and_topic(crawler, university_sigla, topic_keywords, start_year=2020, end_year=2025, max_results=100):
     query = f"{university_sigla} {' '.join(topic_keywords)}"  # Combina a universidade com as palavras-chave do tema
-    params = {
-        'query': query,
-        'limit': max_results,
-        'fields': 'title,authors,paperId,year,venue'
-    }
-    
-    articles = []
-    try:
-        # Realiza a requisição à API do Semantic Scholar
-        response = requests.get(url, params=params)
-        
-        # Verifica o código de resposta
-        if response.status_code == 200:
-            data = response.json()
-            for paper in data.get('data', []):
-                # Verifica se o ano está presente e é um número válido
-                year = paper.get('year', None)
-                if year is None:
-                    year = 0  # Valor padrão caso o ano não esteja presente
+    fields = 'title,authors,paperId,year,venue'
 
-                # Filtra os artigos dentro do intervalo de anos
-                if start_year <= int(year) <= end_year:
-                    # Processa os autores, caso seja uma lista ou dicionário
-                    if isinstance(paper.get('authors', []), list):
-                        authors = ', '.join([author['name'] for author in paper['authors']]) if 'authors' in paper else 'N/A'
-                    else:
-                        authors = 'N/A'  # Caso não seja uma lista de autores válida
-                    
-                    articles.append({
-                        'title': paper['title'],
-                        'authors': authors,
-                        'year': year,
-                        'university': university_sigla,
-                        'venue': paper.get('venue', 'N/A'),
-                        'url': f"https://semanticscholar.org/paper/{paper['paperId']}"
-                    })
-        elif response.status_code == 429:
-            # Se atingir o limite de requisições (429), espera 1 minuto e tenta novamente
-            print(f"Limite de requisições atingido para a universidade {university_sigla}. Esperando 60 segundos...")
-            time.sleep(60)  # Delay de 1 minuto
-            return search_articles_by_university_and_topic(university_sigla, topic_keywords, start_year, end_year, max_results)
-        else:
-            print(f"Erro na requisição para {university_sigla}: {response.status_code}")
-            return []
-    except Exception as e:
-        print(f"Erro na requisição para {university_sigla}: {e}")
+    articles = []
+    # O crawler repete as requisições com 429 (esperando o Retry-After) e devolve None se desistir
+    papers = crawler.search_papers(query, fields, max_results)
+    if papers is None:
+        print(f"Erro na requisição para {university_sigla}")
         return []
-    
+    for paper in papers:
+        # Verifica se o ano está presente e é um número válido
+        year = paper.get('year', None)
+        if year is None:
+            year = 0  # Valor padrão caso o ano não esteja presente
+
+        # Filtra os artigos dentro do intervalo de anos
+        if start_year <= int(year) <= end_year:
+            # Processa os autores, caso seja uma lista ou dicionário
+            if isinstance(paper.get('authors', []), list):
+                authors = ', '.join([author['name'] for author in paper['authors']]) if 'authors' in paper else 'N/A'
+            else:
+                authors = 'N/A'  # Caso não seja uma lista de autores válida
+
+            articles.append({
+                'title': paper['title'],
+                'authors': authors,
+                'year': year,
+                'university': university_sigla,
+                'venue': paper.get('venue', 'N/A'),
+                'url': f"https://semanticscholar.org/paper/{paper['paperId']}"
+            })
+
     return articles
 
 # Função para ler as universidades brasileiras de um arquivo CSV
@@ -93,10 +74,12 @@ def main():
     # Lista para armazenar todos os artigos encontrados
     all_articles = []
 
-    # Busca os artigos no Semantic Scholar para cada universidade
-    for university in universities:
-        print(f"Buscando artigos para a universidade {university}...")
-        articles = search_articles_by_university_and_topic(university, topic_keywords, start_year=2020, end_year=2025)
+    # Busca os artigos no Semantic Scholar, várias universidades ao mesmo tempo
+    crawler = Crawler()
+    def search(university):
+        return search_articles_by_university_and_topic(crawler, university, topic_keywords, start_year=2020, end_year=2025)
+    for university, articles in zip(universities, crawler.map(search, universities)):
+        print(f"Artigos da universidade {university}: {len(articles)}")
         all_articles.extend(articles)
 
     # Salva os artigos no arquivo CSV
@@ -1,67 +1,72 @@
 # How to use (from src/scholar/):
-# python scholar.py
-# python scholar.py -test
+# python teste_sche.py
+# python teste_sche.py --workers 4 --rate 1 (4 threads, no máximo 1 requisição por segundo)
+# python teste_sche.py --max-age 30 (baixa de novo os autores salvos há mais de 30 dias)
+# python teste_sche.py -test
 
 import os
 import sys
 import time
 import csv
-import requests
 import json
+import argparse
+from crawler import Crawler
+
+# O cache em disco é o mesmo dos scripts da DBLP
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DBLP'))
+import cache
 
 # Caminho da pasta de cache
 CACHE_DIR = "../../data/cache/scholar/"
 
-def is_in_cache(prof):
-    file = os.path.join(CACHE_DIR, prof + ".json")
-    return os.path.exists(file)
+# JSONs dos autores no cache compartilhado (src/DBLP/cache.py)
+CACHE = cache.FileCache(CACHE_DIR, '.json')
+
+def is_in_cache(prof, max_age=None):
+    return CACHE.contains(prof, max_age)
 
 def save_cache(prof, data):
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    file = os.path.join(CACHE_DIR, prof + ".json")
-    with open(file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    CACHE.put(prof, json.dumps(data, indent=2).encode('utf-8'))
 
 def read_cache(prof):
-    file = os.path.join(CACHE_DIR, prof + ".json")
-    with open(file, encoding='utf-8') as f:
-        return json.load(f)
-
-def crawl_semantic_scholar(author_id):
-    try:
-        url = f"https://api.semanticscholar.org/graph/v1/author/{author_id}/papers?limit=1000&fields=title,year,venue,authors,citationCount,url"
-        response = requests.get(url, timeout=30)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Erro ao buscar dados do autor {author_id}: {response.status_code}")
-            return None
-    except requests.RequestException as e:
-        print(e)
-        sys.exit(1)
+    data = CACHE.get(prof)
+    if data is None:
+        raise FileNotFoundError(CACHE.get_file_name(prof))
+    return json.loads(data)
 
-def get_scholar_data(author_id, prof):
-    if is_in_cache(prof):
-        return read_cache(prof)
-    else:
-        data = crawl_semantic_scholar(author_id)
-        if data:
-            save_cache(prof, data)
-        return data
+def get_scholar_data(crawler, author_id, prof, max_age=None):
+    # Retorna "cached", "new", "updated" ou "failed"
+    if is_in_cache(prof, max_age):
+        return "cached"
+    cached = is_in_cache(prof)
+    data = crawler.get_author_papers(author_id)
+    if data is None:
+        return "failed"
+    save_cache(prof, data)
+    return "updated" if cached else "new"
 
-def download_all_prof_data():
+def download_all_prof_data(crawler, max_age=None):
     start_time = time.time()
     reader = csv.reader(open("../../data/configs/all-researchers.csv", 'r', encoding='utf-8'))
+    researchers = [(name.replace(" ", "-"), author_id.strip(), institution) for name, author_id, institution in reader]
+
+    def fetch(researcher):
+        prof, author_id, _ = researcher
+        return get_scholar_data(crawler, author_id, prof, max_age)
+
+    failed = []
     count = 1
-    for researcher in reader:
-        name, author_id, institution = researcher
-        print(f"{count} > {name}, {institution}")
-        prof = name.replace(" ", "-")
-        get_scholar_data(author_id, prof)
-        time.sleep(1)  # Para evitar sobrecarga da API
+    for (prof, _, institution), status in zip(researchers, crawler.map(fetch, researchers)):
+        print(f"{count} > {prof}, {institution}: {status}")
+        if status == "failed":
+            failed.append(prof)
         count += 1
+    CACHE.flush()
     elapsed_time = round((time.time() - start_time) / 60, 2)
     print(f"Elapsed time (min): {elapsed_time}")
+    print(cache.format_stats("scholar", CACHE.stats()))
+    if failed:
+        print("Failed: " + ", ".join(failed))
 
 def test_all_prof_data():
     print("Testing cached files...")
@@ -78,8 +83,17 @@ def test_all_prof_data():
             print(f"Erro ao testar cache para {name}: {e}")
         count += 1
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Baixa os artigos dos pesquisadores no Semantic Scholar")
+    parser.add_argument("-test", action="store_true", help="only test the cached files")
+    parser.add_argument("--workers", type=int, default=4, help="número de downloads simultâneos")
+    parser.add_argument("--rate", type=float, default=1.0, help="máximo de requisições por segundo")
+    parser.add_argument("--max-age", type=float, help="baixa de novo os autores salvos há mais de tantos dias")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    download = len(sys.argv) < 2 or sys.argv[1] != "-test"
-    if download:
-        download_all_prof_data()
+    args = parse_args()
+    if not args.test:
+        max_age = args.max_age * 24 * 3600 if args.max_age is not None else None
+        download_all_prof_data(Crawler(rate=args.rate, workers=args.workers), max_age)
     test_all_prof_data()